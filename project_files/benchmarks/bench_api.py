@@ -0,0 +1,168 @@
+"""
+Benchmark suite of the data helpers against the offline mock API.
+
+For every account size, each scenario starts from an empty in-memory cache and reports wall time,
+number of requests, bytes sent by the server, and peak Python memory (tracemalloc). Before timing
+anything, the total_count and paging count engines are checked to return identical counts.
+
+Run from project_files:
+    python -m benchmarks.bench_api --sizes 1000,10000,100000 --latency 0.02
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import mock_api
+import helpers.cacheHelpers as cah
+import helpers.countHelpers as ch
+import helpers.httpHelpers as hh
+import helpers.schedulerHelpers as sch
+import helpers.syncHelpers as syh
+import helpers.wanikaniHelpers as wkh
+
+token = "mock-token"
+
+def measure(server, func):
+    """
+    Description
+        Runs one scenario from an empty in-memory cache and measures it.
+
+    Input
+        server: mock_api.MockServer; Server the helpers talk to.
+        func: function; Scenario, called without arguments.
+
+    Output
+        result: dict; "seconds", "requests", "bytes", and "peak_bytes" (peak traced Python memory).
+
+    Example
+        measure(server = server, func = lambda: wkh.get_levels(token))
+    """
+    sch.reset()
+    cah.clear_cache()
+    server.reset_stats()
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {"seconds": seconds, "requests": server.requests, "bytes": server.bytes_sent, "peak_bytes": peak_bytes}
+
+    return result
+
+def check_engines(size):
+    """
+    Description
+        Checks that the total_count engine and the paging engine (full sync into the local store) return
+        the same count matrix for a generated account.
+
+    Input
+        size: int; Number of assignments in the generated account.
+
+    Output
+        None; Raises AssertionError if the engines disagree.
+
+    Example
+        check_engines(size = 1000)
+    """
+    sch.reset()
+    server = mock_api.start_server(assignments = size)
+    hh.api_url = server.url
+    os.environ["WANIKANI_STATS_DATA_DIR"] = tempfile.mkdtemp(prefix = "wanikani-bench-")
+
+    try:
+        by_total = ch.get_counts_by_total(token)
+
+        syh.sync_assignments(token)
+        by_paging = syh.get_stored_counts(token)
+
+        assert (by_total == by_paging).all(), f"engines disagree for {size} assignments:\n{by_total}\n{by_paging}"
+    finally:
+        server.shutdown()
+
+    return None
+
+def run_size(size, latency):
+    """
+    Description
+        Runs every scenario against a fresh account. Scenarios that model a first visit start from an empty
+        local store; the incremental scenario reuses the store filled by the full sync.
+
+    Input
+        size: int; Number of assignments in the generated account.
+        latency: float; Seconds the mock server adds to every request.
+
+    Output
+        results: list; (scenario name, measure output) tuples.
+
+    Example
+        run_size(size = 10000, latency = 0.02)
+    """
+    server = mock_api.start_server(assignments = size, latency = latency)
+    hh.api_url = server.url
+
+    def new_store():
+        os.environ["WANIKANI_STATS_DATA_DIR"] = tempfile.mkdtemp(prefix = "wanikani-bench-")
+
+    def first_visit():
+        new_store()
+        wkh.get_learned_counts(token)
+
+    def first_report():
+        new_store()
+        wkh.get_learned_counts(token, counts_only = True)
+
+    def full_sync():
+        new_store()
+        syh.sync_assignments(token)
+        syh.get_stored_counts(token)
+
+    def incremental():
+        server.update("assignments", 1001, srs_stage = 5)
+        wkh.get_learned_counts(token)
+
+    scenarios = [
+        ("check_token", lambda: wkh.check_token(token)),
+        ("get_learned_counts (first visit)", first_visit),
+        ("get_learned_counts (report, auto engine)", first_report),
+        ("count engine: total_count", lambda: ch.get_counts_by_total(token)),
+        ("count engine: paging (full sync)", full_sync),
+        ("get_learned_counts (incremental sync)", incremental),
+        ("get_levels", lambda: wkh.get_levels(token))
+    ]
+
+    try:
+        results = [(name, measure(server, func)) for name, func in scenarios]
+    finally:
+        server.shutdown()
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark the data helpers against the mock Wanikani API.")
+    parser.add_argument("--sizes", default = "1000,10000,100000", help = "Comma-separated assignment counts.")
+    parser.add_argument("--latency", type = float, default = 0.02, help = "Seconds added to every request (default: 0.02).")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    for size in sizes:
+        check_engines(size)
+    print(f"count engines agree for {', '.join(str(size) for size in sizes)} assignments")
+
+    for size in sizes:
+        print(f"\n{size} assignments, {args.latency * 1000:.0f} ms latency")
+        print(f"  {'scenario':<40} {'wall ms':>9} {'requests':>9} {'KiB sent':>10} {'peak KiB':>10}")
+        for name, result in run_size(size, args.latency):
+            print(
+                f"  {name:<40} {result['seconds'] * 1000:9.1f} {result['requests']:9d} "
+                f"{result['bytes'] / 1024:10.1f} {result['peak_bytes'] / 1024:10.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Cold-start benchmark of the dashboard: import time of the app modules and first-paint latency.
+
+Every measurement runs in a fresh interpreter, so nothing is already imported.
+First paint is the first full run of app.py for an invalid token (the error-message path),
+against a local stand-in that answers 401, so no network or real token is needed.
+
+Run from project_files:
+    python -m benchmarks.bench_cold_start --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import_script = """
+import time
+start = time.perf_counter()
+import streamlit
+middle = time.perf_counter()
+import helpers.streamlitHelpers
+end = time.perf_counter()
+print(middle - start, end - middle)
+"""
+
+first_paint_script = """
+import http.server, os, threading, time
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'{"error": "Unauthorized. Nice try!", "code": 401}'
+        self.send_response(401)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def log_message(self, *args):
+        pass
+server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target = server.serve_forever, daemon = True).start()
+os.environ["WANIKANI_API_URL"] = f"http://127.0.0.1:{server.server_port}/v2"
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(os.path.abspath("app.py"), default_timeout = 120)
+app.run()
+print(time.perf_counter() - start)
+"""
+
+def run_python(script, *flags):
+    """
+    Description
+        Runs a script in a fresh interpreter from the project directory.
+
+    Input
+        script: string; Python source to run.
+        flags: strings; Extra interpreter flags (e.g. "-X", "importtime").
+
+    Output
+        result: subprocess.CompletedProcess; Finished process with captured stdout and stderr.
+
+    Example
+        run_python("print(1)")
+    """
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", script],
+        cwd = project_dir,
+        capture_output = True,
+        text = True,
+        check = True
+    )
+
+    return result
+
+def get_slowest_imports(limit):
+    """
+    Description
+        Lists the modules with the largest cumulative import time when importing the dashboard helpers.
+
+    Input
+        limit: int; Number of modules to list.
+
+    Output
+        slowest: list; (cumulative milliseconds, module name) tuples, slowest first. Only top-level packages
+            and project modules are listed.
+
+    Example
+        get_slowest_imports(limit = 5)
+
+        [(801.2, "helpers.streamlitHelpers"), (558.0, "pandas"), ...]
+    """
+    stderr = run_python("import streamlit; import helpers.streamlitHelpers", "-X", "importtime").stderr
+
+    slowest = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        if cumulative.isdigit() and (name.startswith("helpers.") or "." not in name):
+            slowest.append((int(cumulative) / 1000, name))
+
+    slowest = sorted(slowest, reverse = True)[:limit]
+
+    return slowest
+
+def main():
+    parser = argparse.ArgumentParser(description = "Measure dashboard cold-start time.")
+    parser.add_argument("--runs", type = int, default = 5, help = "Number of fresh interpreters per measurement.")
+    parser.add_argument("--top", type = int, default = 10, help = "Number of slowest imports to list.")
+    args = parser.parse_args()
+
+    streamlit_times, helper_times, paint_times = [], [], []
+    for _ in range(args.runs):
+        streamlit_seconds, helper_seconds = map(float, run_python(import_script).stdout.split())
+        streamlit_times.append(streamlit_seconds)
+        helper_times.append(helper_seconds)
+        paint_times.append(float(run_python(first_paint_script).stdout.strip().splitlines()[-1]))
+
+    print(f"median of {args.runs} fresh interpreters")
+    print(f"  import streamlit                  {statistics.median(streamlit_times) * 1000:8.1f} ms")
+    print(f"  import helpers.streamlitHelpers   {statistics.median(helper_times) * 1000:8.1f} ms")
+    print(f"  first paint, invalid token        {statistics.median(paint_times) * 1000:8.1f} ms")
+
+    print("slowest imports (cumulative, after streamlit)")
+    for milliseconds, name in get_slowest_imports(args.top):
+        print(f"  {name:<40} {milliseconds:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
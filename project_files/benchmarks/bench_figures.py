@@ -0,0 +1,143 @@
+"""
+Benchmark of figure building: Plotly Express, plotly.graph_objects, and the render cache of renderHelpers.
+
+Builds the items breakdown and level-up times charts from generated data the way the dashboard did before
+(DataFrame + plotly.express), with graph_objects, and through the cache (what a rerun with unchanged data
+costs). Reports the median milliseconds per figure.
+
+Run from project_files:
+    python -m benchmarks.bench_figures --repeat 50
+"""
+import argparse
+import inspect
+import time
+
+import numpy as np
+
+from data import colors
+from data import wanikani
+import helpers.cacheHelpers as cah
+import helpers.renderHelpers as rdh
+import helpers.wanikaniHelpers as wkh
+
+def measure(func, repeat):
+    """
+    Description
+        Calls a function repeatedly and returns the median duration.
+
+    Input
+        func: function; Function without arguments.
+        repeat: int; Number of calls.
+
+    Output
+        ms: float; Median milliseconds per call.
+
+    Example
+        measure(func = lambda: rdh.make_items_breakdown_figure(counts), repeat = 50)
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    ms = sorted(durations)[len(durations) // 2] * 1000
+
+    return ms
+
+def make_items_breakdown_px(counts):
+    """
+    Description
+        Builds the items breakdown chart the way display_items_breakdown did before the render cache.
+
+    Input
+        counts: np.ndarray; Count matrix, shape (10, number of items).
+
+    Output
+        fig: plotly.graph_objects.Figure; Bar chart.
+
+    Example
+        make_items_breakdown_px(counts = counts)
+    """
+    import plotly.express as px
+
+    df = wkh.get_item_breakdown(counts, "Bar Chart")
+
+    fig = px.bar(
+        data_frame = df, x = "Item", y = "Count", color = "Stage", barmode = "group",
+        color_discrete_map = {stage: colors.colors[stage.lower()]["rgb"] for stage in wanikani.stages}
+    )
+
+    return fig
+
+def make_level_up_times_px(level, days, in_progress):
+    """
+    Description
+        Builds the level-up times chart the way display_level_up_times_chart did before the render cache.
+
+    Input
+        level: np.ndarray; Levels.
+        days: np.ndarray; Days spent on each level.
+        in_progress: np.ndarray; Whether each level is still in progress.
+
+    Output
+        fig: plotly.graph_objects.Figure; Bar chart.
+
+    Example
+        make_level_up_times_px(level = level, days = days, in_progress = in_progress)
+    """
+    import pandas as pd
+    import plotly.express as px
+
+    df = pd.DataFrame({"level": level, "time": days, "status": np.where(in_progress, "In progress", "Passed")})
+
+    fig = px.bar(
+        data_frame = df, x = "level", y = "time", color = "status",
+        color_discrete_map = {"Passed": colors.colors["wanikani_blue"]["rgb"], "In progress": colors.colors["wanikani_pink"]["hex"]},
+        labels = {"level": "Level", "time": "Level-Up Time (Days)", "status": "Status"}
+    ).update_xaxes(dtick = 1)
+
+    return fig
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark Plotly Express, graph_objects and cached figures.")
+    parser.add_argument("--repeat", type = int, default = 50, help = "Builds per measurement (default: 50).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    counts = rng.integers(0, 500, size = (10, len(wanikani.items)))
+    level = np.arange(1, 61)
+    days = np.round(rng.uniform(7, 30, size = 60), 1)
+    in_progress = level == 60
+
+    charts = (
+        (
+            "items_breakdown",
+            lambda: make_items_breakdown_px(counts),
+            lambda: inspect.unwrap(rdh.make_items_breakdown_figure)(counts),
+            lambda: rdh.make_items_breakdown_figure(counts)
+        ),
+        (
+            "level_up_times",
+            lambda: make_level_up_times_px(level, days, in_progress),
+            lambda: inspect.unwrap(rdh.make_level_up_times_figure)(level, days, in_progress),
+            lambda: rdh.make_level_up_times_figure(level, days, in_progress)
+        )
+    )
+
+    # Import plotly and fill the cache before measuring.
+    cah.clear_cache()
+    for _, px_build, go_build, cached_build in charts:
+        px_build(), go_build(), cached_build()
+
+    print(f"median ms per figure over {args.repeat} builds")
+    print(f"  {'chart':<16} {'express':>9} {'graph_objects':>14} {'cached':>8} {'to_json':>9}")
+    for name, px_build, go_build, cached_build in charts:
+        fig = cached_build()
+        print(
+            f"  {name:<16} {measure(px_build, args.repeat):9.2f} {measure(go_build, args.repeat):14.2f} "
+            f"{measure(cached_build, args.repeat):8.3f} {measure(fig.to_json, args.repeat):9.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark of field projection against the offline mock API.
+
+Fetches every assignment of a generated account twice, once keeping the full resources and once projected
+onto the fields the assignment store declares (syncHelpers.assignment_fields), and reports the memory the
+result holds and the peak memory of the fetch (tracemalloc).
+
+Run from project_files:
+    python -m benchmarks.bench_projection --sizes 10000,100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks import mock_api
+import helpers.fetchHelpers as fh
+import helpers.httpHelpers as hh
+import helpers.schedulerHelpers as sch
+import helpers.syncHelpers as syh
+
+token = "mock-token"
+
+def measure(url, fields):
+    """
+    Description
+        Fetches all assignments and measures the memory of the result.
+
+    Input
+        url: string; Assignments URL of the mock server.
+        fields: dict or None; Field declaration, None to keep full resources.
+
+    Output
+        result: dict; "seconds", "held_bytes" (memory still used by the result) and "peak_bytes".
+
+    Example
+        measure(url = hh.get_url("assignments"), fields = syh.assignment_fields)
+    """
+    sch.reset()
+    gc.collect()
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    collection = fh.fetch_collection(
+        token = token,
+        url = url,
+        partitions = fh.split_by("srs_stages", range(0, 10)),
+        fields = fields
+    )
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    held_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del collection
+
+    result = {"seconds": seconds, "held_bytes": held_bytes, "peak_bytes": peak_bytes}
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark field projection against the mock Wanikani API.")
+    parser.add_argument("--sizes", default = "10000,100000", help = "Comma-separated assignment counts.")
+    args = parser.parse_args()
+
+    for size in [int(size) for size in args.sizes.split(",")]:
+        server = mock_api.start_server(assignments = size)
+        hh.api_url = server.url
+
+        try:
+            full = measure(hh.get_url("assignments"), None)
+            projected = measure(hh.get_url("assignments"), syh.assignment_fields)
+        finally:
+            server.shutdown()
+
+        print(f"\n{size} assignments")
+        print(f"  {'records':<10} {'wall ms':>9} {'held KiB':>10} {'bytes/row':>10} {'peak KiB':>10}")
+        for name, result in (("full", full), ("projected", projected)):
+            print(
+                f"  {name:<10} {result['seconds'] * 1000:9.1f} {result['held_bytes'] / 1024:10.1f} "
+                f"{result['held_bytes'] / size:10.1f} {result['peak_bytes'] / 1024:10.1f}"
+            )
+        print(f"  held memory cut by {full['held_bytes'] / max(1, projected['held_bytes']):.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark of the rate-limit scheduler against the offline mock API with a per-minute limit.
+
+Two "tabs" download every assignment of the same account while a third calls /user every 5 seconds, like
+check_token does on every rerun. Reports wall time, the number of 429 responses, and how long the
+interactive calls took, with the scheduler on and off.
+
+Run from project_files:
+    python -m benchmarks.bench_rate_limit --assignments 20000 --rate-limit 60
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from benchmarks import mock_api
+from data import wanikani
+import helpers.cacheHelpers as cah
+import helpers.fetchHelpers as fh
+import helpers.httpHelpers as hh
+import helpers.metricsHelpers as mh
+import helpers.schedulerHelpers as sch
+
+token = "mock-token"
+
+def run(server, scheduler):
+    """
+    Description
+        Runs the scenario once.
+
+    Input
+        server: mock_api.MockServer; Rate-limited server.
+        scheduler: bool; Whether the scheduler is enabled.
+
+    Output
+        result: dict; "seconds", "throttled" (429 responses) and "interactive" (durations of the /user calls).
+
+    Example
+        run(server = server, scheduler = True)
+    """
+    sch.reset(enable = scheduler)
+    cah.clear_cache()
+
+    throttled = mh.get_metrics()["counters"].get("http.retries", 0)
+    interactive = []
+    done = threading.Event()
+
+    def sync_tab(partitions):
+        # The tabs split the collection differently, so their requests are not coalesced.
+        fh.fetch_collection(token = token, url = hh.get_url("assignments"), partitions = partitions)
+
+    def interactive_tab():
+        while not done.is_set():
+            start = time.perf_counter()
+            hh.get(token = token, url = hh.get_url("user"))
+            interactive.append(time.perf_counter() - start)
+            time.sleep(5)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = 3) as executor:
+        watcher = executor.submit(interactive_tab)
+        tabs = [fh.split_by("srs_stages", range(0, 10)), fh.split_by("subject_types", wanikani.items)]
+        for future in [executor.submit(sync_tab, partitions) for partitions in tabs]:
+            future.result()
+        done.set()
+        watcher.result()
+    seconds = time.perf_counter() - start
+
+    result = {
+        "seconds": seconds,
+        "throttled": mh.get_metrics()["counters"].get("http.retries", 0) - throttled,
+        "interactive": sorted(interactive)
+    }
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark the rate-limit scheduler against the mock Wanikani API.")
+    parser.add_argument("--assignments", type = int, default = 20000, help = "Number of assignments (default: 20000).")
+    parser.add_argument("--rate-limit", type = int, default = 60, help = "Requests per minute per token (default: 60).")
+    parser.add_argument("--latency", type = float, default = 0.02, help = "Seconds added to every request (default: 0.02).")
+    args = parser.parse_args()
+
+    server = mock_api.start_server(assignments = args.assignments, latency = args.latency, rate_limit = args.rate_limit)
+    hh.api_url = server.url
+
+    print(f"{args.assignments} assignments, {args.rate_limit} requests per minute, 2 syncing tabs + 1 interactive tab")
+    print(f"  {'scheduler':<10} {'wall s':>8} {'429s':>6} {'interactive median ms':>22} {'interactive max ms':>19}")
+
+    try:
+        for scheduler in (False, True):
+            # Start each run in a fresh rate-limit window.
+            time.sleep(60 - time.time() % 60)
+            result = run(server, scheduler)
+            interactive = result["interactive"]
+            print(
+                f"  {'on' if scheduler else 'off':<10} {result['seconds']:8.1f} {result['throttled']:6d} "
+                f"{interactive[len(interactive) // 2] * 1000:22.1f} {interactive[-1] * 1000:19.1f}"
+            )
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
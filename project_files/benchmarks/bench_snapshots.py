@@ -0,0 +1,82 @@
+"""
+Benchmark of the snapshot store behind the progress trend chart.
+
+Records several years of daily snapshots (a few visits per day) for one token in a temporary data directory,
+then reports the append cost, the size on disk and how long date range queries take.
+
+Run from project_files:
+    python -m benchmarks.bench_snapshots --years 1,5 --visits 3
+"""
+import argparse
+from datetime import datetime, timedelta
+import os
+import tempfile
+import time
+
+import numpy as np
+import pytz
+
+import helpers.snapshotHelpers as snh
+
+token = "mock-token"
+
+def measure(func, repeat = 50):
+    """
+    Description
+        Calls a function repeatedly and returns the median duration.
+
+    Input
+        func: function; Function without arguments.
+        repeat: int; Number of calls.
+
+    Output
+        ms: float; Median milliseconds per call.
+
+    Example
+        measure(func = lambda: snh.get_snapshots(token), repeat = 50)
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    ms = sorted(durations)[len(durations) // 2] * 1000
+
+    return ms
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark the progress snapshot store.")
+    parser.add_argument("--years", default = "1,5", help = "Comma-separated history lengths in years.")
+    parser.add_argument("--visits", type = int, default = 3, help = "Visits with changed counts per day (default: 3).")
+    args = parser.parse_args()
+
+    print(f"  {'years':>5} {'days':>6} {'append ms':>10} {'disk KiB':>9} {'30 days ms':>11} {'1 year ms':>10} {'all ms':>8}")
+
+    for years in [int(years) for years in args.years.split(",")]:
+        os.environ["WANIKANI_STATS_DATA_DIR"] = tempfile.mkdtemp()
+
+        rng = np.random.default_rng(0)
+        counts = np.zeros((10, 3), dtype = np.int64)
+        first = datetime(2020, 1, 1, 8, tzinfo = pytz.utc)
+        days = years * 365
+
+        start = time.perf_counter()
+        for day in range(days):
+            for visit in range(args.visits):
+                counts += rng.integers(0, 3, size = counts.shape)
+                snh.record_snapshot(token, counts, first + timedelta(days = day, hours = visit))
+        append_ms = (time.perf_counter() - start) * 1000 / (days * args.visits)
+
+        last = snh.get_day(first + timedelta(days = days - 1))
+        disk = sum(os.path.getsize(path) for path in snh.get_snapshot_paths(token) if os.path.exists(path))
+
+        print(
+            f"  {years:5d} {days:6d} {append_ms:10.3f} {disk / 1024:9.1f} "
+            f"{measure(lambda: snh.get_snapshots(token, start = last - 30)):11.3f} "
+            f"{measure(lambda: snh.get_snapshots(token, start = last - 365)):10.3f} "
+            f"{measure(lambda: snh.get_snapshots(token)):8.3f}"
+        )
+
+if __name__ == "__main__":
+    main()
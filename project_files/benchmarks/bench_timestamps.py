@@ -0,0 +1,85 @@
+"""
+Micro-benchmark of Wanikani timestamp parsing.
+
+Run from project_files:
+    python -m benchmarks.bench_timestamps --count 50000
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+import helpers.helpers as hp
+import pytz
+import timeit
+
+def parse_timestamp_strptime(timestamp, timezone = "America/Los_Angeles"):
+    """
+    Description
+        Previous implementation of helpers.parse_timestamp, kept as the baseline.
+
+    Input
+        timestamp: string or None; ISO-8601 timestamp.
+        timezone: string; Timezone that the timestamp should be converted to.
+
+    Output
+        parsed: datetime or None; Timezone-aware datetime.
+
+    Example
+        parse_timestamp_strptime(timestamp = "2017-09-05T23:38:10.964821Z")
+    """
+    if timestamp is None:
+        return None
+    else:
+        return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f%z").astimezone(tz = pytz.timezone(timezone))
+
+def make_timestamps(count):
+    """
+    Description
+        Generates Wanikani-style timestamps, one per hour.
+
+    Input
+        count: int; Number of timestamps.
+
+    Output
+        timestamps: list; ISO-8601 strings ending in "Z".
+
+    Example
+        make_timestamps(count = 2)
+
+        ["2020-01-01T00:00:00.000000Z", "2020-01-01T01:00:00.123456Z"]
+    """
+    start = datetime(2020, 1, 1, tzinfo = timezone.utc)
+
+    timestamps = [
+        (start + timedelta(hours = i, microseconds = (i * 123456) % 1000000)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        for i in range(count)
+    ]
+
+    return timestamps
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare timestamp parsing implementations.")
+    parser.add_argument("--count", type = int, default = 20000, help = "Number of timestamps per run.")
+    parser.add_argument("--repeat", type = int, default = 5, help = "Number of runs; the best one is reported.")
+    args = parser.parse_args()
+
+    timestamps = make_timestamps(args.count)
+
+    # Sanity check: every implementation agrees before anything is timed.
+    expected = [parse_timestamp_strptime(t) for t in timestamps[:100]]
+    assert [hp.parse_timestamp(t) for t in timestamps[:100]] == expected
+    assert [t.astimezone(pytz.utc).replace(tzinfo = None) for t in expected] == hp.parse_timestamps(timestamps[:100]).tolist()
+
+    cases = {
+        "strptime + pytz.timezone (baseline)": lambda: [parse_timestamp_strptime(t) for t in timestamps],
+        "helpers.parse_timestamp": lambda: [hp.parse_timestamp(t) for t in timestamps],
+        "helpers.parse_timestamps (batch)": lambda: hp.parse_timestamps(timestamps)
+    }
+
+    baseline = None
+    print(f"{args.count} timestamps, best of {args.repeat}")
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number = 1, repeat = args.repeat))
+        baseline = seconds if baseline is None else baseline
+        print(f"  {name:<40} {seconds * 1000:9.1f} ms  {baseline / seconds:6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark of response compression and JSON decoding against the offline mock API.
+
+Runs a full assignment sync for every combination of gzip on/off and the json/orjson decoders, and
+reports wall time, bytes on the wire, decoded bytes and time spent decoding JSON.
+
+Run from project_files:
+    python -m benchmarks.bench_transfer --sizes 10000,100000 --latency 0.02
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks import mock_api
+import helpers.cacheHelpers as cah
+import helpers.httpHelpers as hh
+import helpers.metricsHelpers as mh
+import helpers.schedulerHelpers as sch
+import helpers.syncHelpers as syh
+
+token = "mock-token"
+
+def get_totals():
+    """
+    Description
+        Returns the assignment byte counters and JSON decoding time recorded so far.
+
+    Input
+        None
+
+    Output
+        totals: dict; "wire" and "decoded" bytes, and "decode_seconds".
+
+    Example
+        get_totals()
+    """
+    metrics = mh.get_metrics()
+
+    totals = {
+        "wire": metrics["counters"].get("bytes.wire.assignments", 0),
+        "decoded": metrics["counters"].get("bytes.decoded.assignments", 0),
+        "decode_seconds": metrics["timings"].get("decode.assignments", {}).get("total", 0.0)
+    }
+
+    return totals
+
+def run(size, latency, compress, decoder):
+    """
+    Description
+        Syncs a fresh account into an empty store and measures the transfer.
+
+    Input
+        size: int; Number of assignments in the generated account.
+        latency: float; Seconds the mock server adds to every request.
+        compress: bool; Whether the server gzips responses.
+        decoder: function; JSON decoder used by httpHelpers.
+
+    Output
+        result: dict; "seconds", plus the differences of get_totals over the sync.
+
+    Example
+        run(size = 10000, latency = 0.02, compress = True, decoder = json.loads)
+    """
+    sch.reset()
+    server = mock_api.start_server(assignments = size, latency = latency, compress = compress)
+    hh.api_url = server.url
+    hh.json_loads = decoder
+    os.environ["WANIKANI_STATS_DATA_DIR"] = tempfile.mkdtemp(prefix = "wanikani-bench-")
+    cah.clear_cache()
+
+    try:
+        before = get_totals()
+        start = time.perf_counter()
+        syh.sync_assignments(token)
+        seconds = time.perf_counter() - start
+        after = get_totals()
+    finally:
+        server.shutdown()
+
+    result = {"seconds": seconds, **{name: after[name] - before[name] for name in after}}
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark compression and JSON decoding against the mock Wanikani API.")
+    parser.add_argument("--sizes", default = "10000,100000", help = "Comma-separated assignment counts.")
+    parser.add_argument("--latency", type = float, default = 0.02, help = "Seconds added to every request (default: 0.02).")
+    args = parser.parse_args()
+
+    decoders = [("json", json.loads)]
+    if hh.orjson is not None:
+        decoders.append(("orjson", hh.orjson.loads))
+
+    for size in [int(size) for size in args.sizes.split(",")]:
+        print(f"\n{size} assignments, {args.latency * 1000:.0f} ms latency")
+        print(f"  {'gzip':<6} {'decoder':<8} {'wall ms':>9} {'wire KiB':>10} {'decoded KiB':>12} {'decode ms':>10}")
+        for compress in (False, True):
+            for name, decoder in decoders:
+                result = run(size, args.latency, compress, decoder)
+                print(
+                    f"  {'on' if compress else 'off':<6} {name:<8} {result['seconds'] * 1000:9.1f} "
+                    f"{result['wire'] / 1024:10.1f} {result['decoded'] / 1024:12.1f} {result['decode_seconds'] * 1000:10.1f}"
+                )
+
+if __name__ == "__main__":
+    main()
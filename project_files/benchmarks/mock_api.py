@@ -0,0 +1,439 @@
+"""
+Offline stand-in for the Wanikani API, for benchmarks and local development.
+
+Serves a generated account of configurable size with Wanikani-style pagination (500 resources per page,
+page_after_id cursors), the assignment filters the dashboard uses, and optional per-request latency.
+With a rate limit set, responses carry RateLimit-* headers and a token gets 429 once its per-minute
+budget is used up. With compression on, responses are gzipped for clients that accept it, and the
+byte counts are wire bytes. Any bearer token is accepted except "invalid".
+
+Run from project_files:
+    python -m benchmarks.mock_api --assignments 10000 --port 8080 --latency 0.05
+    WANIKANI_API_URL=http://127.0.0.1:8080/v2 streamlit run app.py
+"""
+import argparse
+import bisect
+from datetime import datetime, timedelta, timezone
+import functools
+import gzip
+import http.server
+import json
+import math
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlencode, urlparse
+
+per_page = 500
+max_level = 60
+
+# Share of each subject type among a typical account's assignments.
+subject_type_weights = {"radical": 0.06, "kanji": 0.24, "vocabulary": 0.66, "kana_vocabulary": 0.04}
+
+def format_timestamp(value):
+    """
+    Description
+        Formats a datetime the way the Wanikani API does.
+
+    Input
+        value: datetime or None; Timezone-aware datetime.
+
+    Output
+        timestamp: string or None; e.g. "2022-06-30T18:04:11.123456Z".
+
+    Example
+        format_timestamp(value = datetime(2022, 6, 30, tzinfo = timezone.utc))
+
+        "2022-06-30T00:00:00.000000Z"
+    """
+    if value is None:
+        return None
+
+    timestamp = value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    return timestamp
+
+def make_account(assignments = 10000, seed = 0, now = None):
+    """
+    Description
+        Generates a deterministic account: user, assignments with their subjects and review statistics,
+        level progressions and resets.
+        The user's current level grows with the number of assignments, and SRS stages skew towards
+        Burned on lower levels and Apprentice on the current level, like a real account.
+
+    Input
+        assignments: int; Number of assignments.
+        seed: int; Random seed.
+        now: datetime or None; Reference time for generated timestamps (default: current time).
+
+    Output
+        account: dict; "user" resource data and a list of resources per collection endpoint.
+
+    Example
+        make_account(assignments = 1000)
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc) if now is None else now
+
+    current_level = max(1, min(max_level, math.ceil(assignments / 150)))
+    started_at = now - timedelta(days = 8 * current_level + 30)
+    level_started = [started_at + timedelta(days = 8 * (level - 1) + rng.uniform(0, 2)) for level in range(1, current_level + 2)]
+
+    records = []
+    subjects = []
+    review_statistics = []
+    for i in range(1, assignments + 1):
+        subject_type = rng.choices(list(subject_type_weights), weights = list(subject_type_weights.values()))[0]
+        level = min(current_level, 1 + int(current_level * rng.random() ** 0.8))
+        age = (current_level - level) / max(1, current_level - 1)
+
+        if level == current_level and rng.random() < 0.3:
+            srs_stage = 0
+        else:
+            srs_stage = min(9, max(1, round(1 + 8 * age + rng.gauss(0, 1.5))))
+
+        unlocked_at = level_started[level - 1] + timedelta(hours = rng.uniform(0, 48))
+        updated_at = min(now, unlocked_at + timedelta(days = rng.uniform(0, 8 * (current_level - level + 1))))
+
+        subjects.append({
+            "id": i,
+            "object": subject_type,
+            "url": None,
+            "data_updated_at": format_timestamp(started_at),
+            "data": {
+                "level": level,
+                "characters": (
+                    None if subject_type == "radical" and rng.random() < 0.1
+                    else chr(0x3042 + i % 80) * 2 if subject_type == "kana_vocabulary"
+                    else chr(0x4e00 + i % 20000) * (1 + (subject_type == "vocabulary"))
+                ),
+                "meanings": [{"meaning": f"Meaning {i}", "primary": True, "accepted_answer": True}],
+                "hidden_at": None
+            }
+        })
+
+        if srs_stage > 0:
+            # Radicals and kana-only vocabulary are only quizzed on their meaning.
+            has_reading = subject_type not in ("radical", "kana_vocabulary")
+            answers = {}
+            for kind in ("meaning", "reading"):
+                correct = srs_stage + rng.randint(0, 4) if kind == "meaning" or has_reading else 0
+                incorrect = min(int(rng.expovariate(0.7)), 12) if kind == "meaning" or has_reading else 0
+                current_streak = max(1, min(correct, srs_stage - rng.randint(0, 2)))
+                answers.update({
+                    f"{kind}_correct": correct,
+                    f"{kind}_incorrect": incorrect,
+                    f"{kind}_max_streak": max(1, correct - incorrect // 2, current_streak),
+                    f"{kind}_current_streak": current_streak
+                })
+            total_correct = answers["meaning_correct"] + answers["reading_correct"]
+            total = total_correct + answers["meaning_incorrect"] + answers["reading_incorrect"]
+
+            review_statistics.append({
+                "id": 200000 + i,
+                "object": "review_statistic",
+                "url": None,
+                "data_updated_at": format_timestamp(updated_at),
+                "data": {
+                    "created_at": format_timestamp(unlocked_at + timedelta(hours = 2)),
+                    "subject_id": i,
+                    "subject_type": subject_type,
+                    **answers,
+                    "percentage_correct": round(100 * total_correct / max(1, total)),
+                    "hidden": False
+                }
+            })
+
+        records.append({
+            "id": 1000 + i,
+            "object": "assignment",
+            "url": None,
+            "data_updated_at": format_timestamp(updated_at),
+            "data": {
+                "created_at": format_timestamp(unlocked_at),
+                "subject_id": i,
+                "subject_type": subject_type,
+                "srs_stage": srs_stage,
+                "unlocked_at": format_timestamp(unlocked_at),
+                "started_at": None if srs_stage == 0 else format_timestamp(unlocked_at + timedelta(hours = 2)),
+                "passed_at": format_timestamp(unlocked_at + timedelta(days = 4)) if srs_stage >= 5 else None,
+                "burned_at": format_timestamp(updated_at) if srs_stage == 9 else None,
+                "available_at": (
+                    format_timestamp(now + timedelta(hours = rng.uniform(-6, 24 * 2 ** (srs_stage - 1))))
+                    if 1 <= srs_stage <= 8 else None
+                ),
+                "resurrected_at": None,
+                "hidden": rng.random() < 0.01
+            }
+        })
+
+    level_progressions = []
+    for level in range(1, current_level + 1):
+        passed = level < current_level
+        level_progressions.append({
+            "id": 500 + level,
+            "object": "level_progression",
+            "data_updated_at": format_timestamp(level_started[level] if passed else level_started[level - 1]),
+            "data": {
+                "level": level,
+                "created_at": format_timestamp(level_started[level - 1]),
+                "unlocked_at": format_timestamp(level_started[level - 1]),
+                "started_at": format_timestamp(level_started[level - 1] + timedelta(hours = 1)),
+                "passed_at": format_timestamp(level_started[level]) if passed else None,
+                "completed_at": None,
+                "abandoned_at": None
+            }
+        })
+
+    account = {
+        "user": {
+            "id": "5a6a5234-a392-4a87-8f3f-33342afe8a42",
+            "username": "mock_user",
+            "level": current_level,
+            "started_at": format_timestamp(started_at),
+            "subscription": {"active": True, "type": "recurring", "max_level_granted": max_level}
+        },
+        "assignments": records,
+        "subjects": subjects,
+        "review_statistics": review_statistics,
+        "level_progressions": level_progressions,
+        "resets": []
+    }
+
+    return account
+
+class MockHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body, headers = None):
+        payload = json.dumps(body).encode("utf-8")
+
+        compress = self.server.compress and "gzip" in self.headers.get("Accept-Encoding", "")
+        if compress:
+            payload = gzip.compress(payload, compresslevel = 6)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        self.server.record(len(payload))
+
+    def do_GET(self):
+        server = self.server
+        if server.latency > 0:
+            time.sleep(server.latency)
+
+        if self.headers.get("Authorization", "") in ("", "Bearer invalid"):
+            return self.send_json(401, {"error": "Unauthorized. Nice try!", "code": 401})
+
+        allowed, headers = server.take_rate_limit(self.headers["Authorization"])
+        if not allowed:
+            return self.send_json(429, {"error": "Rate limit exceeded", "code": 429}, headers)
+
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip("/").split("/")[-1]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if endpoint == "user":
+            return self.send_json(200, {
+                "object": "user",
+                "url": f"{server.url}/user",
+                "data_updated_at": server.account["user"]["started_at"],
+                "data": server.account["user"]
+            }, headers)
+
+        if endpoint not in server.account:
+            return self.send_json(404, {"error": "Not found", "code": 404}, headers)
+
+        page_after_id = int(query.pop("page_after_id", 0))
+        query.pop("page_before_id", None)
+        ids, records, data_updated_at = server.select(endpoint, tuple(sorted(query.items())))
+
+        start = bisect.bisect_right(ids, page_after_id)
+        page = records[start:start + per_page]
+
+        next_url = None
+        if start + per_page < len(records):
+            next_url = f"{server.url}/{endpoint}?{urlencode({**query, 'page_after_id': page[-1]['id']})}"
+
+        return self.send_json(200, {
+            "object": "collection",
+            "url": f"{server.url}/{endpoint}",
+            "pages": {"per_page": per_page, "next_url": next_url, "previous_url": None},
+            "total_count": len(records),
+            "data_updated_at": data_updated_at,
+            "data": page
+        }, headers)
+
+class MockServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, account, host = "127.0.0.1", port = 0, latency = 0.0, rate_limit = 0, compress = False):
+        super().__init__((host, port), MockHandler)
+
+        self.account = account
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.compress = compress
+        self.url = f"http://{host}:{self.server_port}/v2"
+
+        self.lock = threading.Lock()
+        self.windows = {}
+        self.reset_stats()
+
+        self.select = functools.lru_cache(maxsize = 256)(self.filter_records)
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+    def record(self, size):
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += size
+
+    def take_rate_limit(self, authorization):
+        # Fixed one-minute windows per token, like the real API's RateLimit-* headers.
+        if self.rate_limit == 0:
+            return True, {}
+
+        now = time.time()
+        with self.lock:
+            window_start, used = self.windows.get(authorization, (now - now % 60, 0))
+            if now >= window_start + 60:
+                window_start, used = now - now % 60, 0
+            allowed = used < self.rate_limit
+            used += 1 if allowed else 0
+            self.windows[authorization] = (window_start, used)
+
+        headers = {
+            "RateLimit-Limit": self.rate_limit,
+            "RateLimit-Remaining": self.rate_limit - used,
+            "RateLimit-Reset": int(window_start + 60)
+        }
+        if not allowed:
+            headers["Retry-After"] = max(1, math.ceil(window_start + 60 - now))
+
+        return allowed, headers
+
+    def filter_records(self, endpoint, query):
+        query = dict(query)
+        records = self.account[endpoint]
+
+        if "ids" in query:
+            ids = set(int(v) for v in query["ids"].split(","))
+            records = [r for r in records if r["id"] in ids]
+        if "srs_stages" in query:
+            stages = set(int(v) for v in query["srs_stages"].split(","))
+            records = [r for r in records if r["data"]["srs_stage"] in stages]
+        if "subject_types" in query:
+            types = set(query["subject_types"].split(","))
+            records = [r for r in records if r["data"].get("subject_type") in types]
+        if "types" in query:
+            types = set(query["types"].split(","))
+            records = [r for r in records if r["object"] in types]
+        if "levels" in query:
+            levels = set(int(v) for v in query["levels"].split(","))
+            records = [r for r in records if r["data"].get("level") in levels]
+        if "hidden" in query:
+            hidden = query["hidden"] == "true"
+            records = [r for r in records if r["data"].get("hidden", False) == hidden]
+        if "updated_after" in query:
+            records = [r for r in records if r["data_updated_at"] > query["updated_after"]]
+
+        records = sorted(records, key = lambda r: r["id"])
+        data_updated_at = max((r["data_updated_at"] for r in records), default = None)
+
+        return [r["id"] for r in records], records, data_updated_at
+
+    def update(self, endpoint, record_id, now = None, **changes):
+        """
+        Description
+            Changes a resource as the real API would after a review, moving its data_updated_at forward.
+
+        Input
+            endpoint: string; Collection name, e.g. "assignments".
+            record_id: int; Id of the resource.
+            now: datetime or None; New data_updated_at (default: current time).
+            changes: keyword arguments; Fields of "data" to overwrite.
+
+        Output
+            None
+
+        Example
+            server.update("assignments", 1001, srs_stage = 5)
+        """
+        now = datetime.now(timezone.utc) if now is None else now
+
+        for record in self.account[endpoint]:
+            if record["id"] == record_id:
+                record["data"].update(changes)
+                record["data_updated_at"] = format_timestamp(now)
+
+        self.select.cache_clear()
+
+        return None
+
+def start_server(assignments = 10000, seed = 0, latency = 0.0, rate_limit = 0, compress = False, port = 0):
+    """
+    Description
+        Generates an account and serves it on a background thread.
+
+    Input
+        assignments: int; Number of assignments.
+        seed: int; Random seed.
+        latency: float; Seconds added to every request.
+        rate_limit: int; Requests per minute per token before answering 429 (0: no limit and no RateLimit-* headers).
+        compress: bool; Gzip responses when the client accepts it, like the real API.
+        port: int; Port to listen on (0: any free port).
+
+    Output
+        server: MockServer; Running server, its base URL is server.url. Stop it with server.shutdown().
+
+    Example
+        server = start_server(assignments = 1000)
+        os.environ["WANIKANI_API_URL"] = server.url
+    """
+    server = MockServer(
+        make_account(assignments = assignments, seed = seed),
+        port = port,
+        latency = latency,
+        rate_limit = rate_limit,
+        compress = compress
+    )
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description = "Serve a generated Wanikani account.")
+    parser.add_argument("--assignments", type = int, default = 10000, help = "Number of assignments (default: 10000).")
+    parser.add_argument("--seed", type = int, default = 0, help = "Random seed (default: 0).")
+    parser.add_argument("--latency", type = float, default = 0.0, help = "Seconds added to every request (default: 0).")
+    parser.add_argument("--rate-limit", type = int, default = 0, help = "Requests per minute per token, 0 to disable (default: 0).")
+    parser.add_argument("--compress", action = "store_true", help = "Gzip responses when the client accepts it.")
+    parser.add_argument("--port", type = int, default = 8080, help = "Port (default: 8080).")
+    args = parser.parse_args()
+
+    server = MockServer(
+        make_account(assignments = args.assignments, seed = args.seed),
+        port = args.port,
+        latency = args.latency,
+        rate_limit = args.rate_limit,
+        compress = args.compress
+    )
+    print(f"Serving {args.assignments} assignments at {server.url}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -25,5 +25,14 @@ colors = {
     },
     "burned": {
         "rgb": "rgb(74,73,74)"
+    },
+    "radical": {
+        "hex": "#00aaff"
+    },
+    "kanji": {
+        "hex": "#ff00aa"
+    },
+    "vocabulary": {
+        "hex": "#aa00ff"
     }
 }
\ No newline at end of file
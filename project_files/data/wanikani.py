@@ -24,4 +24,22 @@ srs_stages = {
     "Master": {"start": 7, "end": 7},
     "Enlightened": {"start": 8, "end": 8},
     "Burned": {"start": 9, "end": 9}
-}
\ No newline at end of file
+}
+
+subject_types = (
+    "radical",
+    "kanji",
+    "vocabulary",
+    "kana_vocabulary"
+)
+
+# Item type each subject type is counted as. Kana-only vocabulary is vocabulary without kanji, so every
+# section counts it with the other vocabulary.
+item_types = {
+    "radical": "radical",
+    "kanji": "kanji",
+    "vocabulary": "vocabulary",
+    "kana_vocabulary": "vocabulary"
+}
+
+levels = range(1, 61)
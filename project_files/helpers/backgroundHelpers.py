@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+import helpers.metricsHelpers as mh
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+max_workers = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """
+    Description
+        Returns the process-wide thread pool that runs background work (prefetching and cache refreshes).
+
+    Input
+        None
+
+    Output
+        executor: ThreadPoolExecutor; Shared background pool.
+
+    Example
+        get_executor()
+    """
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "wanikani-background")
+
+    return _executor
+
+def submit(name, func, *args, **kwargs):
+    """
+    Description
+        Runs func on the background pool. Errors are logged and counted instead of being raised, since
+        nobody waits for the result; whoever needs the data will call func again and see the error then.
+
+    Input
+        name: string; Name used in metrics and logs, e.g. "prefetch.get_levels".
+        func: function; Work to run.
+        args, kwargs: Arguments of func.
+
+    Output
+        future: concurrent.futures.Future; Future of the call.
+
+    Example
+        submit("prefetch.get_levels", wkh.get_levels, token)
+    """
+    def run():
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            mh.increment(f"background.errors.{name}")
+            logger.exception("Background task %s failed", name)
+
+    mh.increment(f"background.tasks.{name}")
+    future = get_executor().submit(run)
+
+    return future
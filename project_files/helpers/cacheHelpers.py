@@ -0,0 +1,272 @@
+from collections import OrderedDict
+import functools
+import hashlib
+import helpers.backgroundHelpers as bh
+import helpers.flightHelpers as flh
+import helpers.helpers as hp
+import helpers.metricsHelpers as mh
+import inspect
+import numpy as np
+import os
+import pickle
+import sys
+import threading
+import time
+
+# Bump to invalidate every cached entry after a change to the shape of cached results.
+cache_version = "1"
+
+max_bytes = int(os.environ.get("WANIKANI_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+_entries = OrderedDict()
+_lock = threading.RLock()
+_refreshing = set()
+_stats = {"hits": 0, "misses": 0, "stale_hits": 0, "evictions": 0, "expirations": 0, "bytes": 0}
+
+def digest_value(value):
+    """
+    Description
+        Turns a function argument into a cheap, hashable part of a cache key.
+        Small immutable values are used as-is, arrays and containers are reduced to a SHA-256 of their content.
+
+    Input
+        value: any; Function argument.
+
+    Output
+        part: hashable; Value to put in the cache key.
+
+    Example
+        digest_value(value = "Bar Chart")
+
+        "Bar Chart"
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.shape, value.dtype.str, hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest())
+
+    return ("pickle", hashlib.sha256(pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL)).hexdigest())
+
+def make_key(func, args, kwargs):
+    """
+    Description
+        Builds the cache key of a call. A "token" argument is replaced by its SHA-256 digest, so raw API tokens
+        are never kept in memory as cache keys.
+
+    Input
+        func: function; Cached function.
+        args: tuple; Positional arguments of the call.
+        kwargs: dict; Keyword arguments of the call.
+
+    Output
+        key: tuple; Function name, cache version, and one part per argument (defaults included).
+
+    Example
+        make_key(func = get_learned_counts, args = (token,), kwargs = {})
+
+        ("helpers.wanikaniHelpers.get_learned_counts", "1", ("token", "9f86d0..."))
+    """
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+
+    parts = [f"{func.__module__}.{func.__qualname__}", cache_version]
+    for name, value in bound.arguments.items():
+        if name == "token":
+            parts.append((name, hp.get_token_digest(value)))
+        else:
+            parts.append((name, digest_value(value)))
+
+    key = tuple(parts)
+
+    return key
+
+def estimate_size(value, seen = None):
+    """
+    Description
+        Estimates the memory used by a cached value, following containers, NumPy arrays and pandas objects.
+
+    Input
+        value: any; Cached value.
+        seen: set or None; Ids of objects already counted (used by the recursion).
+
+    Output
+        size: int; Approximate size in bytes.
+
+    Example
+        estimate_size(value = counts)
+
+        368
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + (0 if value.base is None else value.nbytes)
+
+    if hasattr(value, "memory_usage") and callable(value.memory_usage):
+        usage = value.memory_usage(deep = True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, seen) for v in value)
+    elif hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), seen)
+
+    return size
+
+def evict(budget):
+    """
+    Description
+        Drops least recently used entries until the cache fits in a memory budget. Caller must hold the lock.
+
+    Input
+        budget: int; Maximum number of bytes to keep.
+
+    Output
+        None
+
+    Example
+        evict(budget = max_bytes)
+    """
+    while _stats["bytes"] > budget and len(_entries) > 0:
+        _, (_, _, size) = _entries.popitem(last = False)
+        _stats["bytes"] -= size
+        _stats["evictions"] += 1
+
+    return None
+
+def cached(ttl, stale_ttl = 0):
+    """
+    Description
+        Decorator that caches a function's results in the shared, memory-bounded LRU cache.
+        Entries expire after ttl seconds; the least recently used entries are evicted once the cache
+        grows past max_bytes. Concurrent misses on the same key are coalesced into a single call.
+        With stale_ttl, an expired entry is still served for that long (stale-while-revalidate): the caller
+        gets the last good result right away and the entry is refreshed on the background pool.
+
+    Input
+        ttl: int or float; Time to live of an entry in seconds.
+        stale_ttl: int or float; Seconds after expiry during which the old value is served while refreshing (default: 0).
+
+    Output
+        decorator: function; Decorator to apply to the cached function.
+
+    Example
+        @cached(ttl = 300)
+        def get_learned_counts(token):
+            ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(func, args, kwargs)
+
+            def compute():
+                value = func(*args, **kwargs)
+                size = estimate_size(value)
+
+                if size <= max_bytes:
+                    with _lock:
+                        previous = _entries.pop(key, None)
+                        if previous is not None:
+                            _stats["bytes"] -= previous[2]
+
+                        _entries[key] = (value, time.monotonic() + ttl, size)
+                        _stats["bytes"] += size
+                        evict(max_bytes)
+
+                return value
+
+            def refresh():
+                try:
+                    flh.do(key, compute)
+                finally:
+                    with _lock:
+                        _refreshing.discard(key)
+
+            now = time.monotonic()
+
+            with _lock:
+                entry = _entries.get(key)
+                if entry is not None:
+                    value, expires_at, size = entry
+                    if expires_at > now:
+                        _entries.move_to_end(key)
+                        _stats["hits"] += 1
+                        mh.increment(f"cache.hits.{func.__name__}")
+                        return value
+
+                    # Serve the last good value and refresh it once in the background.
+                    if expires_at + stale_ttl > now:
+                        _entries.move_to_end(key)
+                        _stats["stale_hits"] += 1
+                        mh.increment(f"cache.stale_hits.{func.__name__}")
+                        if key not in _refreshing:
+                            _refreshing.add(key)
+                            bh.submit(f"refresh.{func.__name__}", refresh)
+                        return value
+
+                    del _entries[key]
+                    _stats["bytes"] -= size
+                    _stats["expirations"] += 1
+
+                _stats["misses"] += 1
+                mh.increment(f"cache.misses.{func.__name__}")
+
+            # Concurrent misses on the same key (other tabs, other users of the same token) share one computation.
+            return flh.do(key, compute)
+
+        wrapper.cache_ttl = ttl
+        wrapper.cache_stale_ttl = stale_ttl
+
+        return wrapper
+
+    return decorator
+
+def get_cache_stats():
+    """
+    Description
+        Returns the hit, miss, eviction and expiration counters of the shared cache, with its current size.
+
+    Input
+        None
+
+    Output
+        stats: dict; Counters, number of entries, and bytes in use.
+
+    Example
+        get_cache_stats()
+
+        {"hits": 40, "misses": 6, "stale_hits": 2, "evictions": 0, "expirations": 1, "bytes": 21504, "entries": 5, "max_bytes": 67108864}
+    """
+    with _lock:
+        stats = dict(_stats, entries = len(_entries), max_bytes = max_bytes)
+
+    return stats
+
+def clear_cache():
+    """
+    Description
+        Drops every cached entry. Counters are kept.
+
+    Input
+        None
+
+    Output
+        None
+
+    Example
+        clear_cache()
+    """
+    with _lock:
+        _entries.clear()
+        _stats["bytes"] = 0
+
+    return None
@@ -0,0 +1,133 @@
+from concurrent.futures import ThreadPoolExecutor
+from data import wanikani
+import helpers.httpHelpers as hh
+import math
+import numpy as np
+
+per_page = 500
+max_workers = 8
+
+def get_count_cells():
+    """
+    Description
+        Lists the (SRS stage, item type) cells that make up the count matrix.
+
+    Input
+        None
+
+    Output
+        cells: list; One (srs_stage, item) tuple per cell, 27 in total.
+
+    Example
+        get_count_cells()
+
+        [(1, "radical"), (1, "kanji"), (1, "vocabulary"), (2, "radical"), ...]
+    """
+    cells = [(srs_stage, item) for srs_stage in range(1, 10) for item in wanikani.items]
+
+    return cells
+
+def get_total_count(token, params):
+    """
+    Description
+        Returns the number of assignments matching a filter, read from the total_count of the first page.
+        Only a single request is sent, no matter how many pages the filter would span.
+
+    Input
+        token: string; User supplied token.
+        params: dict; Assignment filters.
+
+    Output
+        total_count: int; Number of matching assignments.
+
+    Example
+        get_total_count(token = token, params = {"srs_stages": "9", "subject_types": "kanji", "hidden": "false"})
+
+        300
+    """
+    total_count = hh.get_json(token = token, url = hh.get_url("assignments"), params = params, priority = "bulk")["total_count"]
+
+    return total_count
+
+def get_assignment_total(token):
+    """
+    Description
+        Returns the number of non-hidden assignments a user has in SRS stages 1-9.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        total_count: int; Number of assignments the full paging engine would have to download.
+
+    Example
+        get_assignment_total(token = token)
+
+        2531
+    """
+    total_count = get_total_count(token, {"srs_stages": "1,2,3,4,5,6,7,8,9", "hidden": "false"})
+
+    return total_count
+
+def choose_count_engine(total_count):
+    """
+    Description
+        Picks the engine that sends fewer requests for an account of a given size. Paging is the first
+        assignment sync, which pages each subject type separately: at most one request per subject type plus
+        one per page. The total_count engine sends one request per cell, plus the one that read total_count.
+
+    Input
+        total_count: int; Number of assignments to count.
+
+    Output
+        engine: string; Possible values: "paging", "total_count"
+
+    Example
+        choose_count_engine(total_count = 20000)
+
+        "total_count"
+    """
+    paging_requests = len(wanikani.subject_types) + math.ceil(total_count / per_page)
+    total_count_requests = len(get_count_cells()) + 1
+
+    engine = "total_count" if paging_requests > total_count_requests else "paging"
+
+    return engine
+
+def get_counts_by_total(token):
+    """
+    Description
+        Builds the count matrix from one filtered query per (SRS stage, item type) cell, reading each
+        response's total_count instead of paging through the assignments. Queries run in parallel.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        counts: np.ndarray; Number of assignments indexed by (SRS stage, item type), shape (10, number of items).
+
+    Example
+        get_counts_by_total(token = token)
+
+        array([[  0,   0,   0],
+               [  0,   4,  11],
+               ...
+               [225, 300, 901]])
+    """
+    cells = get_count_cells()
+
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+        totals = executor.map(
+            lambda cell: get_total_count(token, {
+                "srs_stages": str(cell[0]),
+                "subject_types": ",".join(t for t in wanikani.subject_types if wanikani.item_types[t] == cell[1]),
+                "hidden": "false"
+            }),
+            cells
+        )
+
+        counts = np.zeros((10, len(wanikani.items)), dtype = np.int64)
+        for (srs_stage, item), total in zip(cells, totals):
+            counts[srs_stage, wanikani.items.index(item)] = total
+
+    return counts
@@ -0,0 +1,225 @@
+from concurrent.futures import ThreadPoolExecutor
+import helpers.httpHelpers as hh
+import helpers.metricsHelpers as mh
+import helpers.projectionHelpers as ph
+
+max_workers = 6
+
+def split_by(param, values):
+    """
+    Description
+        Splits a collection into one partition per filter value. Each partition is an independent query.
+
+    Input
+        param: string; Name of a filter that accepts a single value (e.g. "subject_types", "srs_stages").
+        values: iterable; Values to split on. Together they must cover the whole collection.
+
+    Output
+        partitions: list; One dict of extra query parameters per partition.
+
+    Example
+        split_by(param = "srs_stages", values = range(0, 10))
+
+        [{"srs_stages": "0"}, {"srs_stages": "1"}, ..., {"srs_stages": "9"}]
+    """
+    partitions = [{param: str(value)} for value in values]
+
+    return partitions
+
+def split_by_id_ranges(boundaries):
+    """
+    Description
+        Splits a collection into id ranges using page_after_id. Partition i starts after boundaries[i - 1]
+        and stops once it reaches boundaries[i]; the last partition runs to the end of the collection.
+
+    Input
+        boundaries: list; Sorted resource ids to split at.
+
+    Output
+        partitions: list; One dict of extra query parameters per partition. "before_id" is not sent to the
+            API, it tells fetch_partition where to stop.
+
+    Example
+        split_by_id_ranges(boundaries = [5000, 10000])
+
+        [{"before_id": 5000}, {"page_after_id": "4999", "before_id": 10000}, {"page_after_id": "9999"}]
+    """
+    partitions = []
+    lower = None
+
+    for upper in list(boundaries) + [None]:
+        partition = {}
+        if lower is not None:
+            partition["page_after_id"] = str(lower - 1)
+        if upper is not None:
+            partition["before_id"] = upper
+        partitions.append(partition)
+        lower = upper
+
+    return partitions
+
+def iter_pages(token, url, params = None):
+    """
+    Description
+        Yields the pages of a collection one at a time, following next_url. Only the current page is held in memory.
+        Pages are requested with bulk priority, so interactive requests of the same token go first.
+
+    Input
+        token: string; User supplied token.
+        url: string; Full URL of the collection endpoint.
+        params: dict or None; Query parameters of the first page.
+
+    Output
+        pages: generator; Decoded JSON response of each page.
+
+    Example
+        for page in iter_pages(token = token, url = hh.get_url("assignments")):
+            print(page["pages"]["next_url"])
+    """
+    response = hh.get_json(token = token, url = url, params = params, priority = "bulk")
+    counter = f"pages.{hh.get_endpoint(url)}"
+
+    while True:
+        mh.increment(counter)
+        yield response
+
+        next_url = response["pages"]["next_url"]
+        if not next_url:
+            break
+
+        response = hh.get_json(token = token, url = next_url, priority = "bulk")
+
+def iter_collection(token, url, params = None):
+    """
+    Description
+        Yields every resource of a collection across all of its pages, for any endpoint.
+
+    Input
+        token: string; User supplied token.
+        url: string; Full URL of the collection endpoint.
+        params: dict or None; Query parameters.
+
+    Output
+        records: generator; One resource (dict with "id", "object", "data", ...) at a time.
+
+    Example
+        for record in iter_collection(token = token, url = hh.get_url("level_progressions")):
+            print(record["data"]["level"])
+    """
+    for page in iter_pages(token = token, url = url, params = params):
+        yield from page["data"]
+
+def fetch_partition(token, url, params, fields = None):
+    """
+    Description
+        Fetches every page of a single query, one page after another. With fields, each page is projected
+        as soon as it is decoded (see projectionHelpers) and only the declared columns are kept.
+
+    Input
+        token: string; User supplied token.
+        url: string; Full URL of the collection endpoint.
+        params: dict; Query parameters, optionally with a "before_id" upper bound.
+        fields: dict or None; Field declaration, see projectionHelpers.project.
+
+    Output
+        collection: dict; "data" (list of resources) or, with fields, "columns" (list of projected pages),
+            plus "total_count" and "data_updated_at" of the query.
+
+    Example
+        fetch_partition(token = token, url = hh.get_url("assignments"), params = {"srs_stages": "9"})
+    """
+    params = dict(params)
+    before_id = params.pop("before_id", None)
+
+    collection = {"data": [], "columns": [], "total_count": 0, "data_updated_at": None}
+
+    for i, page in enumerate(iter_pages(token = token, url = url, params = params)):
+        if i == 0:
+            collection["total_count"] = page.get("total_count", 0)
+            collection["data_updated_at"] = page.get("data_updated_at")
+
+        data = page["data"]
+        if before_id is not None:
+            data = [d for d in data if d["id"] < before_id]
+
+        if fields is None:
+            collection["data"].extend(data)
+        else:
+            collection["columns"].append(ph.project(data, fields))
+
+        if len(data) < len(page["data"]):
+            break
+
+    return collection
+
+def fetch_collection(token, url, params = None, partitions = None, fields = None):
+    """
+    Description
+        Fetches a whole collection. When partitions are given, each partition is paged on its own thread
+        (at most max_workers at a time) and the results are merged in id order, so the output does not
+        depend on which partition finished first.
+
+    Input
+        token: string; User supplied token.
+        url: string; Full URL of the collection endpoint.
+        params: dict or None; Query parameters shared by every partition.
+        partitions: list or None; Extra query parameters per partition, see split_by and split_by_id_ranges.
+        fields: dict or None; Field declaration (must include "id"), see projectionHelpers.project.
+            Pages are projected as they arrive instead of keeping the full resources.
+
+        A resource returned by two partitions (it changed while they were fetched) is kept in its most recently
+        updated version.
+
+    Output
+        collection: dict; "data" (list of resources sorted by id) or, with fields, "columns" (dict of arrays
+            sorted by id), plus "total_count" (number of merged resources) and the latest "data_updated_at".
+
+    Example
+        fetch_collection(
+            token = token,
+            url = hh.get_url("assignments"),
+            params = {"hidden": "false"},
+            partitions = split_by("subject_types", wanikani.items)
+        )
+    """
+    params = params or {}
+    partitions = partitions or [{}]
+
+    if len(partitions) == 1:
+        results = [fetch_partition(token, url, {**params, **partitions[0]}, fields)]
+    else:
+        with ThreadPoolExecutor(max_workers = min(max_workers, len(partitions))) as executor:
+            results = list(executor.map(
+                lambda partition: fetch_partition(token, url, {**params, **partition}, fields),
+                partitions
+            ))
+
+    updated = [result["data_updated_at"] for result in results if result["data_updated_at"] is not None]
+
+    if fields is not None:
+        # The column projected from data_updated_at, if declared, picks the newest copy of duplicated ids.
+        latest = next((name for name, (path, _) in fields.items() if path == "data_updated_at"), None)
+        columns = ph.concat([part for result in results for part in result["columns"]], fields, key = "id", latest = latest)
+
+        collection = {
+            "columns": columns,
+            "total_count": len(columns["id"]),
+            "data_updated_at": max(updated) if len(updated) > 0 else None
+        }
+
+        return collection
+
+    data = {}
+    for result in results:
+        for d in result["data"]:
+            previous = data.get(d["id"])
+            if previous is None or (d.get("data_updated_at") or "") > (previous.get("data_updated_at") or ""):
+                data[d["id"]] = d
+
+    collection = {
+        "data": [data[key] for key in sorted(data.keys())],
+        "total_count": len(data),
+        "data_updated_at": max(updated) if len(updated) > 0 else None
+    }
+
+    return collection
@@ -0,0 +1,95 @@
+import helpers.helpers as hp
+import helpers.metricsHelpers as mh
+import threading
+
+_calls = {}
+_lock = threading.Lock()
+_stats = {"calls": 0, "shared": 0}
+
+def make_request_key(endpoint, params, token):
+    """
+    Description
+        Builds the single-flight key of an API request. The token is replaced by its SHA-256 digest.
+
+    Input
+        endpoint: string; Requested URL or endpoint name.
+        params: dict or None; Query parameters.
+        token: string; User supplied token.
+
+    Output
+        key: tuple; Hashable key identifying identical requests.
+
+    Example
+        make_request_key(endpoint = "assignments", params = {"hidden": "false"}, token = token)
+
+        ("assignments", (("hidden", "false"),), "9f86d0...")
+    """
+    key = (endpoint, tuple(sorted((params or {}).items())), hp.get_token_digest(token))
+
+    return key
+
+def do(key, func):
+    """
+    Description
+        Runs func once per key at a time. Callers that arrive while a call with the same key is in flight
+        wait for it and receive the same result (or the same exception) instead of starting their own.
+
+    Input
+        key: hashable; Identifies identical work, e.g. from make_request_key.
+        func: function; Work to run, called without arguments.
+
+    Output
+        result: any; Return value of func.
+
+    Example
+        do(key = make_request_key("assignments", params, token), func = lambda: sync_assignments(token))
+    """
+    with _lock:
+        call = _calls.get(key)
+        if call is None:
+            call = {"event": threading.Event(), "result": None, "error": None}
+            _calls[key] = call
+            _stats["calls"] += 1
+            leader = True
+        else:
+            _stats["shared"] += 1
+            leader = False
+
+    if not leader:
+        mh.increment("flight.shared")
+        call["event"].wait()
+    else:
+        try:
+            call["result"] = func()
+        except BaseException as error:
+            call["error"] = error
+        finally:
+            with _lock:
+                del _calls[key]
+            call["event"].set()
+
+    if call["error"] is not None:
+        raise call["error"]
+
+    return call["result"]
+
+def get_flight_stats():
+    """
+    Description
+        Returns how many calls actually ran and how many duplicate calls were saved by sharing a result.
+
+    Input
+        None
+
+    Output
+        stats: dict; "calls" run, "shared" (duplicates saved), and "in_flight" right now.
+
+    Example
+        get_flight_stats()
+
+        {"calls": 14, "shared": 3, "in_flight": 0}
+    """
+    with _lock:
+        stats = dict(_stats, in_flight = len(_calls))
+
+    return stats
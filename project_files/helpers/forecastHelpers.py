@@ -0,0 +1,75 @@
+from data import wanikani
+from datetime import timezone
+import numpy as np
+
+def get_bin_start(now, bin_hours):
+    """
+    Description
+        Returns where the first forecast bin starts: the start of the current hour for hourly bins, midnight
+        of the current day (in now's timezone) for daily bins. Wanikani schedules reviews on the hour, so
+        aligned bins do not split a batch of reviews in two.
+
+    Input
+        now: datetime; Timezone-aware current time.
+        bin_hours: int; Width of a bin in hours.
+
+    Output
+        start: np.datetime64; Start of the first bin in UTC (timezone-naive, like helpers.parse_timestamps).
+
+    Example
+        get_bin_start(now = hp.get_current_timestamp(), bin_hours = 24)
+
+        numpy.datetime64('2022-07-01T07:00:00.000000')
+    """
+    if bin_hours % 24 == 0:
+        start = now.replace(hour = 0, minute = 0, second = 0, microsecond = 0)
+    else:
+        start = now.replace(minute = 0, second = 0, microsecond = 0)
+
+    # pytz timezones need localize to pick the UTC offset in effect at midnight (it may differ from now's on DST days).
+    if hasattr(now.tzinfo, "localize"):
+        start = now.tzinfo.localize(start.replace(tzinfo = None))
+
+    start = np.datetime64(start.astimezone(timezone.utc).replace(tzinfo = None), "us")
+
+    return start
+
+def bin_available_at(available_at, types, now, bin_hours = 1, bins = 24):
+    """
+    Description
+        Counts upcoming reviews per time bin and item type with one vectorized histogram. Reviews that are
+        already available fall into the first bin; reviews past the last bin are ignored.
+
+    Input
+        available_at: np.ndarray; datetime64[us] review times in UTC, e.g. from syncHelpers.get_stored_available_at.
+        types: np.ndarray; Index of each review's item type in wanikani.items.
+        now: datetime; Timezone-aware current time.
+        bin_hours: int; Width of a bin in hours (default: 1).
+        bins: int; Number of bins (default: 24).
+
+    Output
+        starts: np.ndarray; datetime64[us] start of each bin in UTC.
+        forecast: np.ndarray; Number of reviews indexed by (bin, item type), shape (bins, number of items).
+
+    Example
+        bin_available_at(available_at = available_at, types = types, now = hp.get_current_timestamp(), bin_hours = 24, bins = 7)
+
+        (array(['2022-07-01T07:00:00.000000', ...]), array([[ 12,  40, 101], [  3,  18,  66], ...]))
+    """
+    start = get_bin_start(now, bin_hours)
+    width = np.timedelta64(bin_hours, "h")
+
+    scheduled = ~np.isnat(available_at)
+    index = np.maximum((available_at[scheduled] - start) // width, 0)
+    types = types[scheduled]
+    keep = index < bins
+
+    n_items = len(wanikani.items)
+    forecast = np.bincount(
+        index[keep] * n_items + types[keep],
+        minlength = bins * n_items
+    ).reshape(bins, n_items)
+
+    starts = start + width * np.arange(bins)
+
+    return starts, forecast
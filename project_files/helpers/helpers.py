@@ -1,11 +1,34 @@
 from datetime import datetime
+import functools
+import hashlib
+import numpy as np
+import os
 import pytz
 
+@functools.lru_cache(maxsize = None)
+def get_timezone(timezone = "America/Los_Angeles"):
+    """
+    Description
+        Returns a timezone object. Looking a timezone up by name is slow, so each one is built once and reused.
+
+    Input
+        timezone: string; IANA timezone name (default: "America/Los_Angeles").
+
+    Output
+        tz: pytz timezone; Timezone object.
+
+    Example
+        get_timezone(timezone = "UTC")
+
+        <UTC>
+    """
+    return pytz.timezone(timezone)
+
 def get_current_timestamp(timezone = "America/Los_Angeles"):
     """
     Insert docstring here...
     """
-    return datetime.now(tz = pytz.timezone(timezone))
+    return datetime.now(tz = get_timezone(timezone))
 
 def parse_timestamp(timestamp, timezone = "America/Los_Angeles"):
     """
@@ -13,11 +36,104 @@ def parse_timestamp(timestamp, timezone = "America/Los_Angeles"):
     """
     if timestamp is None:
         return None
-    else:
-        return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f%z").astimezone(tz = pytz.timezone(timezone))
+
+    # Wanikani timestamps look like "2017-09-05T23:38:10.964821Z"; fromisoformat is much faster than strptime
+    # but only understands the "Z" suffix from Python 3.11 on.
+    try:
+        parsed = datetime.fromisoformat(timestamp[:-1] + "+00:00" if timestamp.endswith("Z") else timestamp)
+    except ValueError:
+        parsed = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f%z")
+
+    return parsed.astimezone(tz = get_timezone(timezone))
+
+def parse_timestamps(timestamps):
+    """
+    Description
+        Converts a whole column of Wanikani timestamps to a NumPy datetime64 array in one call.
+
+    Input
+        timestamps: iterable; ISO-8601 strings or None.
+
+    Output
+        parsed: np.ndarray; datetime64[us] values in UTC (timezone-naive), NaT where the input was None.
+
+    Example
+        parse_timestamps(timestamps = ["2017-09-05T23:38:10.964821Z", None])
+
+        array(['2017-09-05T23:38:10.964821', 'NaT'], dtype='datetime64[us]')
+    """
+    values = [
+        "NaT" if timestamp is None
+        else timestamp[:-1] if timestamp.endswith("Z")
+        else parse_timestamp(timestamp, timezone = "UTC").strftime("%Y-%m-%dT%H:%M:%S.%f")
+        for timestamp in timestamps
+    ]
+
+    return np.array(values, dtype = "datetime64[us]")
+
+def format_timestamp(timestamp):
+    """
+    Description
+        Formats a timezone-aware datetime the way the Wanikani API does, e.g. for an updated_after filter.
+
+    Input
+        timestamp: datetime; Timezone-aware timestamp.
+
+    Output
+        formatted: string; ISO-8601 timestamp in UTC ending in "Z".
+
+    Example
+        format_timestamp(timestamp = get_current_timestamp("UTC"))
+
+        "2026-10-18T16:23:34.582143Z"
+    """
+    formatted = timestamp.astimezone(get_timezone("UTC")).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    return formatted
 
 def seconds_to_days(seconds):
     """
     Insert docstring here...
     """
     return seconds / 86400
+
+def get_token_digest(token):
+    """
+    Description
+        Returns the SHA-256 digest of a token. Cache keys, stored rows and file names use it instead of the
+        raw token, so the token itself is never kept or written to disk.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        token_digest: string; Hexadecimal SHA-256 digest.
+
+    Example
+        get_token_digest(token = "test")
+
+        "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def get_data_dir():
+    """
+    Description
+        Returns the directory of the local stores (assignments, subject catalog, snapshots), creating it if
+        needed. Set WANIKANI_STATS_DATA_DIR to move it.
+
+    Input
+        None
+
+    Output
+        data_dir: string; Path of the directory.
+
+    Example
+        get_data_dir()
+
+        "/home/jdngo/.cache/wanikani-stats-dashboard"
+    """
+    data_dir = os.environ.get("WANIKANI_STATS_DATA_DIR", os.path.join(os.path.expanduser("~"), ".cache", "wanikani-stats-dashboard"))
+    os.makedirs(data_dir, exist_ok = True)
+
+    return data_dir
@@ -0,0 +1,354 @@
+from collections import deque
+import helpers.flightHelpers as flh
+import helpers.metricsHelpers as mh
+import helpers.schedulerHelpers as sch
+import json
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+# orjson decodes large pages several times faster than the standard library; it is optional.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+api_url = os.environ.get("WANIKANI_API_URL", "https://api.wanikani.com/v2").rstrip("/")
+
+pool_size = 16
+timeout = (5, 30)
+max_retries = 4
+backoff_base = 0.5
+backoff_max = 30.0
+retry_statuses = (429, 500, 502, 503, 504)
+
+# Every encoding urllib3 can decode here: gzip and deflate, plus br/zstd when brotli/zstandard are installed.
+accept_encoding = ACCEPT_ENCODING.replace(",", ", ")
+json_loads = orjson.loads if orjson is not None else json.loads
+
+_session = None
+_session_lock = threading.Lock()
+
+_latencies = deque(maxlen = 2000)
+_latencies_lock = threading.Lock()
+
+def get_url(endpoint):
+    """
+    Description
+        Builds the full URL of a Wanikani API endpoint.
+
+    Input
+        endpoint: string; Endpoint path, with or without a leading slash.
+
+    Output
+        url: string; Full URL of the endpoint.
+
+    Example
+        get_url(endpoint = "assignments")
+
+        "https://api.wanikani.com/v2/assignments"
+    """
+    url = f'{api_url}/{endpoint.lstrip("/")}'
+
+    return url
+
+def get_endpoint(url):
+    """
+    Description
+        Extracts the endpoint name from a Wanikani API URL, for labelling metrics.
+
+    Input
+        url: string; Full URL, with or without a query string.
+
+    Output
+        endpoint: string; Last path segment of the URL.
+
+    Example
+        get_endpoint(url = "https://api.wanikani.com/v2/assignments?page_after_id=80469434")
+
+        "assignments"
+    """
+    endpoint = url.split("?")[0].rstrip("/").split("/")[-1]
+
+    return endpoint
+
+def get_session():
+    """
+    Description
+        Returns the process-wide requests session. The session keeps TCP/TLS connections alive
+        and pools them, so consecutive pages of a collection reuse the same connection.
+
+    Input
+        None
+
+    Output
+        session: requests.Session; Shared session used for every Wanikani API call.
+
+    Example
+        get_session()
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers["Accept-Encoding"] = accept_encoding
+                adapter = HTTPAdapter(pool_connections = 4, pool_maxsize = pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+
+    return _session
+
+def get_backoff(attempt, response = None):
+    """
+    Description
+        Returns the number of seconds to wait before retrying a failed call.
+        Uses the Retry-After header when the server sends one, else full-jitter exponential backoff.
+
+    Input
+        attempt: int; Zero-based number of the attempt that just failed.
+        response: requests.Response or None; Failed response, if any.
+
+    Output
+        seconds: float; Time to sleep before the next attempt.
+
+    Example
+        get_backoff(attempt = 2)
+
+        1.37
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), backoff_max)
+            except ValueError:
+                pass
+
+    seconds = random.uniform(0, min(backoff_max, backoff_base * (2 ** attempt)))
+
+    return seconds
+
+def record_latency(url, status, seconds, attempts):
+    """
+    Description
+        Records the latency of a single API call.
+
+    Input
+        url: string; Requested URL (query string excluded).
+        status: int or None; HTTP status code, None if no response was received.
+        seconds: float; Wall time of the call, including retries.
+        attempts: int; Number of attempts made.
+
+    Output
+        None
+
+    Example
+        record_latency(url = url, status = 200, seconds = 0.21, attempts = 1)
+    """
+    with _latencies_lock:
+        _latencies.append({"url": url, "status": status, "seconds": seconds, "attempts": attempts})
+
+    mh.record_timing(f"http.{get_endpoint(url)}", seconds, status = status, attempts = attempts)
+    mh.increment("http.requests")
+    mh.increment("http.retries", attempts - 1)
+
+    return None
+
+def get_latency_stats():
+    """
+    Description
+        Summarizes the latencies of the most recent API calls.
+
+    Input
+        None
+
+    Output
+        stats: dict; Number of calls, retries, and mean/median/p95/max latency in seconds.
+
+    Example
+        get_latency_stats()
+
+        {"calls": 12, "retries": 1, "mean": 0.18, "median": 0.15, "p95": 0.41, "max": 0.44}
+    """
+    with _latencies_lock:
+        records = list(_latencies)
+
+    if len(records) == 0:
+        return {"calls": 0, "retries": 0, "mean": None, "median": None, "p95": None, "max": None}
+
+    seconds = sorted(r["seconds"] for r in records)
+
+    stats = {
+        "calls": len(records),
+        "retries": sum(r["attempts"] - 1 for r in records),
+        "mean": sum(seconds) / len(seconds),
+        "median": seconds[len(seconds) // 2],
+        "p95": seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))],
+        "max": seconds[-1]
+    }
+
+    return stats
+
+def get(token, url, params = None, wanikani_revision = "20170710", priority = "interactive"):
+    """
+    Description
+        Sends a GET request to the Wanikani API through the shared session, once the rate-limit scheduler
+        allows it. Connection errors, timeouts, and 429/5xx responses are retried with jittered backoff.
+
+    Input
+        token: string; User supplied token.
+        url: string; Full URL to request (next_url values from paginated responses can be passed as-is).
+        params: dict or None; Query string parameters.
+        wanikani_revision: string; Wanikani's API version.
+        priority: string; Scheduler priority, "interactive" or "bulk" (see schedulerHelpers.acquire).
+
+    Output
+        response: requests.Response; Last response received. Non-retryable errors are returned, not raised.
+
+    Example
+        get(token = token, url = get_url("user"))
+    """
+    session = get_session()
+    headers = {
+        "Wanikani-Revision": wanikani_revision,
+        "Authorization": f"Bearer {token}"
+    }
+
+    start = time.perf_counter()
+    attempt = 0
+
+    while True:
+        sch.acquire(token, priority)
+
+        try:
+            response = session.get(url = url, params = params, headers = headers, timeout = timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            sch.update(token, None)
+            if attempt >= max_retries:
+                record_latency(url.split("?")[0], None, time.perf_counter() - start, attempt + 1)
+                raise
+            time.sleep(get_backoff(attempt))
+            attempt += 1
+            continue
+
+        sch.update(token, response)
+
+        if response.status_code in retry_statuses and attempt < max_retries:
+            time.sleep(get_backoff(attempt, response))
+            attempt += 1
+            continue
+
+        record_latency(url.split("?")[0], response.status_code, time.perf_counter() - start, attempt + 1)
+
+        return response
+
+def record_transfer(url, wire_bytes, decoded_bytes):
+    """
+    Description
+        Records the size of a response body on the wire (compressed) and after decompression.
+
+    Input
+        url: string; Requested URL.
+        wire_bytes: int; Body bytes received from the server.
+        decoded_bytes: int; Body bytes after Content-Encoding was removed.
+
+    Output
+        None
+
+    Example
+        record_transfer(url = url, wire_bytes = 21504, decoded_bytes = 301920)
+    """
+    endpoint = get_endpoint(url)
+
+    mh.increment(f"bytes.wire.{endpoint}", wire_bytes)
+    mh.increment(f"bytes.decoded.{endpoint}", decoded_bytes)
+
+    return None
+
+def get_transfer_stats():
+    """
+    Description
+        Returns the bytes received per endpoint, on the wire and after decompression.
+
+    Input
+        None
+
+    Output
+        stats: dict; Endpoint to "wire", "decoded" and "ratio" (decoded / wire).
+
+    Example
+        get_transfer_stats()
+
+        {"assignments": {"wire": 215040, "decoded": 3019200, "ratio": 14.0}}
+    """
+    counters = mh.get_metrics()["counters"]
+
+    stats = {}
+    for name, value in counters.items():
+        if name.startswith("bytes.wire."):
+            endpoint = name[len("bytes.wire."):]
+            decoded = counters.get(f"bytes.decoded.{endpoint}", 0)
+            stats[endpoint] = {"wire": value, "decoded": decoded, "ratio": decoded / value if value > 0 else None}
+
+    return stats
+
+def decode_json(response):
+    """
+    Description
+        Decodes the JSON body of a response with the fastest available decoder (orjson if installed, else
+        the json module), and records its size on the wire and decoded.
+
+    Input
+        response: requests.Response; Response to decode.
+
+    Output
+        body: dict; Decoded JSON response.
+
+    Example
+        decode_json(response = get(token = token, url = get_url("user")))
+    """
+    content = response.content
+
+    # urllib3 counts the bytes read from the socket, before decompression.
+    wire_bytes = response.raw.tell() if hasattr(response.raw, "tell") else 0
+    record_transfer(response.url, wire_bytes or int(response.headers.get("Content-Length", len(content))), len(content))
+
+    with mh.timer(f"decode.{get_endpoint(response.url)}"):
+        body = json_loads(content)
+
+    return body
+
+def get_json(token, url, params = None, wanikani_revision = "20170710", priority = "interactive"):
+    """
+    Description
+        Same as get, but returns the decoded JSON body. Identical requests that are in flight at the same
+        time share one HTTP call.
+
+    Input
+        token: string; User supplied token.
+        url: string; Full URL to request.
+        params: dict or None; Query string parameters.
+        wanikani_revision: string; Wanikani's API version.
+        priority: string; Scheduler priority, "interactive" or "bulk".
+
+    Output
+        body: dict; Decoded JSON response.
+
+    Example
+        get_json(token = token, url = get_url("assignments"), params = {"hidden": "false"})
+    """
+    def fetch():
+        response = get(token = token, url = url, params = params, wanikani_revision = wanikani_revision, priority = priority)
+
+        return decode_json(response)
+
+    body = flh.do(flh.make_request_key(url, params, token) + (wanikani_revision,), fetch)
+
+    return body
@@ -0,0 +1,212 @@
+import helpers.helpers as hp
+import numpy as np
+
+def get_now():
+    """
+    Description
+        Returns the current time in the representation used by the progression arrays.
+
+    Input
+        None
+
+    Output
+        now: np.datetime64; Current UTC time, timezone-naive, in microseconds.
+
+    Example
+        get_now()
+
+        numpy.datetime64('2022-06-30T18:04:11.123456')
+    """
+    now = np.datetime64(hp.get_current_timestamp("UTC").replace(tzinfo = None), "us")
+
+    return now
+
+def build_progressions(level_progressions, resets):
+    """
+    Description
+        Turns level progression and reset resources into aligned arrays with one row per level, sorted by level.
+        Progressions abandoned by a reset, or created before a confirmed reset to that level or lower, are dropped.
+        If a level was progressed more than once, the most recent progression is kept.
+
+    Input
+        level_progressions: iterable; Resources from /v2/level_progressions.
+        resets: iterable; Resources from /v2/resets.
+
+    Output
+        progressions: dict; "level" (int array), "started_at" and "passed_at" (datetime64[us] UTC arrays, NaT if not
+            reached yet), and "index" (dict of level to row, for O(1) lookups).
+
+    Example
+        build_progressions(level_progressions = level_progressions, resets = resets)
+
+        {
+            "level": array([1, 2, 3]),
+            "started_at": array(['2022-01-01T10:00:00.000000', ...], dtype='datetime64[us]'),
+            "passed_at": array(['2022-01-05T08:30:00.000000', ..., 'NaT'], dtype='datetime64[us]'),
+            "index": {1: 0, 2: 1, 3: 2}
+        }
+    """
+    # (confirmed_at, target_level) of every confirmed reset
+    confirmed_resets = [
+        (r["data"]["confirmed_at"], r["data"]["target_level"])
+        for r in resets
+        if r["data"].get("confirmed_at") is not None
+    ]
+
+    latest = {}
+    for p in level_progressions:
+        d = p["data"]
+
+        if d.get("abandoned_at") is not None:
+            continue
+
+        created_at = d.get("created_at") or ""
+        if any(created_at < confirmed_at and d["level"] >= target_level for confirmed_at, target_level in confirmed_resets):
+            continue
+
+        if d["level"] not in latest or created_at > (latest[d["level"]].get("created_at") or ""):
+            latest[d["level"]] = d
+
+    levels = sorted(latest.keys())
+
+    progressions = {
+        "level": np.array(levels, dtype = np.int64),
+        "started_at": hp.parse_timestamps([latest[l].get("started_at") for l in levels]),
+        "passed_at": hp.parse_timestamps([latest[l].get("passed_at") for l in levels]),
+        "index": {l: i for i, l in enumerate(levels)}
+    }
+
+    return progressions
+
+def get_elapsed_days(progressions, now = None):
+    """
+    Description
+        Computes the time spent on every level at once. Levels in progress are measured up to now.
+
+    Input
+        progressions: dict; Output from build_progressions.
+        now: np.datetime64 or None; Reference time for levels in progress (default: current time).
+
+    Output
+        elapsed_days: np.ndarray; Days per level, NaN for levels that were not started.
+        in_progress: np.ndarray; True for levels that were started but not passed.
+
+    Example
+        get_elapsed_days(progressions = progressions)
+
+        (array([ 3.9,  7.2, 12.5]), array([False, False,  True]))
+    """
+    now = get_now() if now is None else now
+
+    started = ~np.isnat(progressions["started_at"])
+    in_progress = started & np.isnat(progressions["passed_at"])
+
+    end = np.where(in_progress, now, progressions["passed_at"])
+    elapsed_days = (end - progressions["started_at"]) / np.timedelta64(1, "D")
+    elapsed_days[~started] = np.nan
+
+    return elapsed_days, in_progress
+
+def get_level_up_stats(progressions):
+    """
+    Description
+        Summarizes level-up times (days from level start to level passed) over every completed level.
+        Levels in progress are left out, since their time is not final.
+
+    Input
+        progressions: dict; Output from build_progressions.
+
+    Output
+        stats: dict; mean, median, variance, standard_deviation, min and max in days (None without completed levels).
+
+    Example
+        get_level_up_stats(progressions = progressions)
+
+        {"mean": 9.4, "median": 8.1, "variance": 12.3, "standard_deviation": 3.5, "min": 6.9, "max": 21.0}
+    """
+    elapsed_days, in_progress = get_elapsed_days(progressions)
+    times = np.sort(elapsed_days[~in_progress & ~np.isnan(elapsed_days)])
+
+    if len(times) == 0:
+        return {
+            "mean": None,
+            "median": None,
+            "variance": None,
+            "standard_deviation": None,
+            "min": None,
+            "max": None
+        }
+
+    n = len(times)
+    mean = times.mean()
+    variance = np.mean((times - mean) ** 2)
+    median = times[n // 2] if n % 2 == 1 else (times[n // 2 - 1] + times[n // 2]) / 2
+
+    return {
+        "mean": round(float(mean), 1),
+        "median": round(float(median), 1),
+        "variance": round(float(variance), 1),
+        "standard_deviation": round(float(np.sqrt(variance)), 1),
+        "min": round(float(times[0]), 1),
+        "max": round(float(times[-1]), 1)
+    }
+
+def get_level_stats(selected_level, progressions):
+    """
+    Description
+        Returns the time spent on a level and the difference to the previous level. Lookups go through the
+        level index, so changing the selected level does not recompute or refetch anything.
+
+    Input
+        selected_level: int; Level to describe.
+        progressions: dict; Output from build_progressions.
+
+    Output
+        level_stats: dict; Time on the selected and previous level (days, None if unknown), their difference,
+            and whether the selected level is still in progress.
+
+    Example
+        get_level_stats(selected_level = 3, progressions = progressions)
+
+        {
+            "level": 3,
+            "time_on_level": 12.5,
+            "previous_level": 2,
+            "time_on_previous_level": 7.2,
+            "delta": 5.3,
+            "delta_color": "inverse",
+            "in_progress": True
+        }
+    """
+    elapsed_days, in_progress = get_elapsed_days(progressions)
+    index = progressions["index"]
+
+    def days(level):
+        i = index.get(level)
+        if i is None or np.isnan(elapsed_days[i]):
+            return None
+        return round(float(elapsed_days[i]), 1)
+
+    time_on_level = days(selected_level)
+
+    if selected_level > 1:
+        previous_level = selected_level - 1
+        time_on_previous_level = days(previous_level)
+    else:
+        previous_level = None
+        time_on_previous_level = None
+
+    if time_on_level is not None and time_on_previous_level is not None:
+        time_difference = round(time_on_level - time_on_previous_level, 1)
+    else:
+        time_difference = None
+
+    return {
+        "level": selected_level,
+        "time_on_level": time_on_level,
+        "previous_level": previous_level,
+        "time_on_previous_level": time_on_previous_level,
+        "delta": time_difference,
+        "delta_color": "inverse",
+        "in_progress": bool(in_progress[index[selected_level]]) if selected_level in index else False
+    }
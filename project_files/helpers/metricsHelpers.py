@@ -0,0 +1,207 @@
+from contextlib import contextmanager
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+metrics_file = os.environ.get("WANIKANI_METRICS_FILE")
+
+_timings = {}
+_counters = {}
+_lock = threading.Lock()
+
+def record_timing(name, seconds, **fields):
+    """
+    Description
+        Records the duration of one call or block, and logs it as a structured (JSON) debug message.
+
+    Input
+        name: string; Metric name, e.g. "helper.wanikaniHelpers.get_learned_counts" or "http.assignments".
+        seconds: float; Duration.
+        fields: keyword arguments; Extra context for the log message (e.g. status = 200).
+
+    Output
+        None
+
+    Example
+        record_timing("http.assignments", 0.21, status = 200)
+    """
+    with _lock:
+        timing = _timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0})
+        timing["count"] += 1
+        timing["total"] += seconds
+        timing["max"] = max(timing["max"], seconds)
+        timing["last"] = seconds
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(json.dumps({"metric": name, "seconds": round(seconds, 6), **fields}))
+
+    return None
+
+def increment(name, amount = 1):
+    """
+    Description
+        Adds to a counter, e.g. pages fetched or cache hits.
+
+    Input
+        name: string; Counter name, e.g. "pages.assignments".
+        amount: int; Amount to add (default: 1).
+
+    Output
+        None
+
+    Example
+        increment("pages.assignments")
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+    return None
+
+@contextmanager
+def timer(name):
+    """
+    Description
+        Context manager that records the duration of a block of code.
+
+    Input
+        name: string; Metric name.
+
+    Output
+        None
+
+    Example
+        with timer("render.items_breakdown"):
+            st.plotly_chart(fig)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start)
+
+def timed(func):
+    """
+    Description
+        Decorator that records the duration of every call of a helper under "helper.<module>.<function>".
+        Place it above a cache decorator so cache hits are timed too.
+
+    Input
+        func: function; Helper to time.
+
+    Output
+        wrapper: function; Timed helper.
+
+    Example
+        @timed
+        def get_learned_counts(token):
+            ...
+    """
+    name = f'helper.{func.__module__.split(".")[-1]}.{func.__name__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_timing(name, time.perf_counter() - start)
+
+    return wrapper
+
+def get_metrics():
+    """
+    Description
+        Returns a snapshot of every timing and counter recorded so far in this process.
+
+    Input
+        None
+
+    Output
+        metrics: dict; "timings" (name to count, total, max and last seconds) and "counters" (name to value).
+
+    Example
+        get_metrics()
+
+        {
+            "timings": {"http.assignments": {"count": 3, "total": 0.61, "max": 0.25, "last": 0.18}, ...},
+            "counters": {"pages.assignments": 3, "cache.hits.get_learned_counts": 4, ...}
+        }
+    """
+    with _lock:
+        metrics = {
+            "timings": {name: dict(timing) for name, timing in _timings.items()},
+            "counters": dict(_counters)
+        }
+
+    return metrics
+
+def format_metrics(gauges = None):
+    """
+    Description
+        Formats the metrics in the Prometheus text exposition format, so a scraper can collect them.
+
+    Input
+        gauges: dict or None; Extra point-in-time values to include (name to number), e.g. cache size.
+
+    Output
+        text: string; Metrics text.
+
+    Example
+        format_metrics(gauges = {"cache.bytes": 21504})
+
+        '# TYPE wanikani_timing_seconds summary\nwanikani_timing_seconds_sum{name="http.assignments"} 0.61\n...'
+    """
+    metrics = get_metrics()
+
+    lines = ["# TYPE wanikani_timing_seconds summary"]
+    for name, timing in sorted(metrics["timings"].items()):
+        lines.append(f'wanikani_timing_seconds_sum{{name="{name}"}} {timing["total"]:.6f}')
+        lines.append(f'wanikani_timing_seconds_count{{name="{name}"}} {timing["count"]}')
+
+    lines.append("# TYPE wanikani_timing_max_seconds gauge")
+    for name, timing in sorted(metrics["timings"].items()):
+        lines.append(f'wanikani_timing_max_seconds{{name="{name}"}} {timing["max"]:.6f}')
+
+    lines.append("# TYPE wanikani_events_total counter")
+    for name, value in sorted(metrics["counters"].items()):
+        lines.append(f'wanikani_events_total{{name="{name}"}} {value}')
+
+    lines.append("# TYPE wanikani_value gauge")
+    for name, value in sorted((gauges or {}).items()):
+        lines.append(f'wanikani_value{{name="{name}"}} {value}')
+
+    text = "\n".join(lines) + "\n"
+
+    return text
+
+def write_metrics_file(path = None, gauges = None):
+    """
+    Description
+        Writes the metrics text atomically to a file (default: the WANIKANI_METRICS_FILE environment variable).
+        Does nothing if no path is configured.
+
+    Input
+        path: string or None; Output file.
+        gauges: dict or None; Extra point-in-time values, see format_metrics.
+
+    Output
+        None
+
+    Example
+        write_metrics_file(path = "/var/lib/node_exporter/wanikani.prom")
+    """
+    path = path or metrics_file
+    if not path:
+        return None
+
+    temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary_path, "w", encoding = "utf-8") as f:
+        f.write(format_metrics(gauges))
+    os.replace(temporary_path, path)
+
+    return None
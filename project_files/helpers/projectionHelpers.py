@@ -0,0 +1,175 @@
+import helpers.helpers as hp
+import numpy as np
+
+def category(*values):
+    """
+    Description
+        Declares a column whose values come from a small, known set. The column holds int8 codes
+        (index into values, -1 for anything else) instead of one Python string per record.
+
+    Input
+        values: strings; Allowed values, in code order.
+
+    Output
+        dtype: tuple; Column type to use in a field declaration.
+
+    Example
+        category("radical", "kanji", "vocabulary")
+
+        ("category", ("radical", "kanji", "vocabulary"))
+    """
+    dtype = ("category", tuple(values))
+
+    return dtype
+
+def get_value(record, path):
+    """
+    Description
+        Reads a (possibly nested) value from a resource, e.g. "data.srs_stage".
+
+    Input
+        record: dict; API resource.
+        path: string; Dot-separated keys.
+
+    Output
+        value: any; The value, None if a key is missing.
+
+    Example
+        get_value(record = assignment, path = "data.srs_stage")
+
+        5
+    """
+    value = record
+    for key in path.split("."):
+        if value is None:
+            return None
+        value = value.get(key)
+
+    return value
+
+def project(records, fields):
+    """
+    Description
+        Reduces resources to the fields a consumer declared, stored as one typed NumPy array per field.
+        Call it on each page as soon as it is decoded, so the full resources are never kept.
+
+    Input
+        records: list; API resources.
+        fields: dict; Column name to (path, dtype). dtype is a NumPy dtype, "datetime64[us]" (parsed from
+            ISO-8601, NaT for None), or category(...).
+
+    Output
+        columns: dict; Column name to array, all of length len(records).
+
+    Example
+        project(
+            records = page["data"],
+            fields = {
+                "id": ("id", np.int64),
+                "srs_stage": ("data.srs_stage", np.int8),
+                "subject_type": ("data.subject_type", category("radical", "kanji", "vocabulary"))
+            }
+        )
+
+        {"id": array([80469434, ...]), "srs_stage": array([5, ...], dtype=int8), "subject_type": array([1, ...], dtype=int8)}
+    """
+    columns = {}
+
+    for name, (path, dtype) in fields.items():
+        values = [get_value(record, path) for record in records]
+
+        if isinstance(dtype, tuple) and dtype[0] == "category":
+            codes = {value: code for code, value in enumerate(dtype[1])}
+            columns[name] = np.fromiter((codes.get(value, -1) for value in values), dtype = np.int8, count = len(values))
+        elif dtype == "datetime64[us]":
+            columns[name] = hp.parse_timestamps(values)
+        else:
+            columns[name] = np.array(values, dtype = dtype)
+
+    return columns
+
+def concat(parts, fields, key = None, latest = None):
+    """
+    Description
+        Joins projected pages into one set of columns. With a key, rows are sorted by it and duplicate keys
+        are kept once. Duplicates come from partitions fetched at different times: an assignment that changes
+        SRS stage meanwhile shows up in two stage partitions, so with latest the most recent copy is kept.
+
+    Input
+        parts: list; Outputs from project.
+        fields: dict; Field declaration the parts were projected with.
+        key: string or None; Column to sort and deduplicate on.
+        latest: string or None; Column that orders copies of a key (e.g. the update time); the largest wins.
+            Without it, which copy is kept is unspecified.
+
+    Output
+        columns: dict; Column name to array.
+
+    Example
+        concat(parts = [project(page["data"], fields) for page in pages], fields = fields, key = "id", latest = "updated_at")
+    """
+    if len(parts) == 0:
+        return project([], fields)
+
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in fields}
+
+    if key is not None:
+        if latest is None:
+            _, keep = np.unique(columns[key], return_index = True)
+        else:
+            # Sort by key, then by latest (NaT as int64 is the smallest value, so it never wins), and keep the
+            # last row of each key.
+            order_by = columns[latest].astype(np.int64) if columns[latest].dtype.kind == "M" else columns[latest]
+            order = np.lexsort((order_by, columns[key]))
+            keys = columns[key][order]
+            last = np.ones(len(keys), dtype = np.bool_)
+            last[:-1] = keys[1:] != keys[:-1]
+            keep = order[last]
+
+        columns = {name: column[keep] for name, column in columns.items()}
+
+    return columns
+
+def decode_category(codes, dtype):
+    """
+    Description
+        Turns category codes back into their values.
+
+    Input
+        codes: np.ndarray; int8 codes from project.
+        dtype: tuple; The category(...) the column was declared with.
+
+    Output
+        values: list; Values, None for code -1.
+
+    Example
+        decode_category(codes = columns["subject_type"], dtype = category("radical", "kanji", "vocabulary"))
+
+        ["kanji", "vocabulary", ...]
+    """
+    values = [None if code < 0 else dtype[1][code] for code in codes.tolist()]
+
+    return values
+
+def format_timestamps(values):
+    """
+    Description
+        Formats datetime64 values the way the Wanikani API does, the inverse of helpers.parse_timestamps.
+
+    Input
+        values: np.ndarray; datetime64[us] values in UTC.
+
+    Output
+        timestamps: list; ISO-8601 strings ending in "Z", None for NaT.
+
+    Example
+        format_timestamps(values = columns["available_at"])
+
+        ["2022-07-01T02:00:00.000000Z", None, ...]
+    """
+    strings = np.datetime_as_string(values, unit = "us")
+    missing = np.isnat(values)
+
+    timestamps = [None if m else f"{s}Z" for s, m in zip(strings.tolist(), missing.tolist())]
+
+    return timestamps
@@ -0,0 +1,333 @@
+from data import colors
+from data import wanikani
+import helpers.cacheHelpers as cah
+import helpers.metricsHelpers as mh
+import helpers.wanikaniHelpers as wkh
+import numpy as np
+
+# Finished figures and tables are cached under a digest of the data they show (see cacheHelpers.make_key),
+# so a rerun with the same counts reuses them instead of building them again. The charts hold a few dozen bars
+# at most, so they are built with plotly.graph_objects directly: plotly.express goes through a DataFrame and
+# is several times slower for the same figure (see benchmarks/bench_figures.py).
+# Callers must not modify the returned objects, which are shared by every session.
+render_ttl = 60 * 60
+
+@mh.timed
+@cah.cached(ttl = render_ttl)
+def make_items_breakdown_figure(counts):
+    """
+    Description
+        Builds the grouped bar chart of items per stage group.
+
+    Input
+        counts: np.ndarray; Count matrix from get_learned_counts, shape (10, number of items).
+
+    Output
+        fig: plotly.graph_objects.Figure; Bar chart with one trace per stage group.
+
+    Example
+        make_items_breakdown_figure(counts = counts)
+    """
+    import plotly.graph_objects as go
+
+    labels = [wanikani.item_labels[item] for item in wanikani.items]
+    group_counts = wkh.get_stage_group_counts(counts)
+
+    fig = go.Figure(
+        data = [
+            go.Bar(name = stage, x = labels, y = group_counts[i].tolist(), marker_color = colors.colors[stage.lower()]["rgb"])
+            for i, stage in enumerate(wanikani.stages)
+        ],
+        layout = go.Layout(
+            barmode = "group",
+            xaxis_title = "Item",
+            yaxis_title = "Count",
+            legend_title = "Stage"
+        )
+    )
+
+    return fig
+
+@mh.timed
+@cah.cached(ttl = render_ttl)
+def make_items_breakdown_table(counts):
+    """
+    Description
+        Builds the table of items per stage group, with an "All" row.
+
+    Input
+        counts: np.ndarray; Count matrix from get_learned_counts, shape (10, number of items).
+
+    Output
+        df: pd.DataFrame; Output from wanikaniHelpers.get_item_breakdown with breakdown_type "Table".
+
+    Example
+        make_items_breakdown_table(counts = counts)
+    """
+    df = wkh.get_item_breakdown(counts, "Table")
+
+    return df
+
+@mh.timed
+@cah.cached(ttl = render_ttl)
+def make_review_forecast_figure(times, forecast):
+    """
+    Description
+        Builds the stacked bar chart of upcoming reviews by item type.
+
+    Input
+        times: tuple; Label of each bin.
+        forecast: np.ndarray; Reviews per bin and item, shape (number of bins, number of items).
+
+    Output
+        fig: plotly.graph_objects.Figure; Stacked bar chart with one trace per item.
+
+    Example
+        make_review_forecast_figure(times = ("Fri 09:00", "Fri 10:00", ...), forecast = forecast)
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        data = [
+            go.Bar(name = wanikani.item_labels[item], x = list(times), y = forecast[:, i].tolist(), marker_color = colors.colors[item]["hex"])
+            for i, item in enumerate(wanikani.items)
+        ],
+        layout = go.Layout(
+            barmode = "stack",
+            xaxis = {"type": "category", "categoryorder": "array", "categoryarray": list(times)},
+            yaxis_title = "Reviews",
+            legend_title = "Item"
+        )
+    )
+
+    return fig
+
+@mh.timed
+@cah.cached(ttl = render_ttl)
+def make_progress_trend_figure(dates, trend):
+    """
+    Description
+        Builds the line chart of learned items over time, one line per item type.
+
+    Input
+        dates: np.ndarray; datetime64[D] day of each snapshot.
+        trend: np.ndarray; Number of items indexed by (day, item type).
+
+    Output
+        fig: plotly.graph_objects.Figure; Line chart.
+
+    Example
+        make_progress_trend_figure(dates = dates, trend = trend)
+    """
+    import plotly.graph_objects as go
+
+    x = dates.astype(str).tolist()
+
+    fig = go.Figure(
+        data = [
+            go.Scatter(
+                name = wanikani.item_labels[item], x = x, y = trend[:, i].tolist(),
+                mode = "lines+markers", line_color = colors.colors[item]["hex"]
+            )
+            for i, item in enumerate(wanikani.items)
+        ],
+        layout = go.Layout(
+            xaxis = {"type": "date"},
+            yaxis_title = "Items",
+            legend_title = "Item"
+        )
+    )
+
+    return fig
+
+@mh.timed
+@cah.cached(ttl = render_ttl)
+def make_level_breakdown_figure(level, level_counts):
+    """
+    Description
+        Builds the stacked bar chart of items per level by item type.
+
+    Input
+        level: np.ndarray; Levels shown.
+        level_counts: np.ndarray; Number of items indexed by (level, item type).
+
+    Output
+        fig: plotly.graph_objects.Figure; Stacked bar chart with one trace per item.
+
+    Example
+        make_level_breakdown_figure(level = np.arange(1, 11), level_counts = level_counts)
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        data = [
+            go.Bar(name = wanikani.item_labels[item], x = level.tolist(), y = level_counts[:, i].tolist(), marker_color = colors.colors[item]["hex"])
+            for i, item in enumerate(wanikani.items)
+        ],
+        layout = go.Layout(
+            barmode = "stack",
+            xaxis = {"title": "Level", "dtick": 1},
+            yaxis_title = "Items",
+            legend_title = "Item"
+        )
+    )
+
+    return fig
+
+@mh.timed
+@cah.cached(ttl = render_ttl)
+def make_level_up_times_figure(level, days, in_progress):
+    """
+    Description
+        Builds the bar chart of the time spent on each level. The level in progress is drawn in pink.
+
+    Input
+        level: np.ndarray; Levels that were started.
+        days: np.ndarray; Days spent on each level, rounded to 0.1 so the figure of the level in progress is
+            only rebuilt when the displayed value changes.
+        in_progress: np.ndarray; Whether each level is still in progress.
+
+    Output
+        fig: plotly.graph_objects.Figure; Bar chart with a "Passed" and an "In progress" trace.
+
+    Example
+        make_level_up_times_figure(level = level, days = np.round(elapsed_days, 1), in_progress = in_progress)
+    """
+    import plotly.graph_objects as go
+
+    traces = []
+    for status, mask, color in (
+        ("Passed", ~in_progress, colors.colors["wanikani_blue"]["rgb"]),
+        ("In progress", in_progress, colors.colors["wanikani_pink"]["hex"])
+    ):
+        if mask.any():
+            traces.append(go.Bar(name = status, x = level[mask].tolist(), y = days[mask].tolist(), marker_color = color))
+
+    fig = go.Figure(
+        data = traces,
+        layout = go.Layout(
+            xaxis = {"title": "Level", "dtick": 1},
+            yaxis_title = "Level-Up Time (Days)",
+            legend_title = "Status"
+        )
+    )
+
+    return fig
+
+@mh.timed
+@cah.cached(ttl = render_ttl)
+def make_accuracy_by_level_figure(level, accuracy, leeches):
+    """
+    Description
+        Builds the bar chart of the answer accuracy on each level, with the number of leeches on hover.
+
+    Input
+        level: np.ndarray; Levels with answers.
+        accuracy: np.ndarray; Accuracy in percent, rounded to 0.1.
+        leeches: np.ndarray; Number of leeches on each level.
+
+    Output
+        fig: plotly.graph_objects.Figure; Bar chart.
+
+    Example
+        make_accuracy_by_level_figure(level = by_level["level"], accuracy = np.round(by_level["accuracy"], 1), leeches = by_level["leeches"])
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        data = [go.Bar(
+            x = level.tolist(),
+            y = accuracy.tolist(),
+            customdata = leeches.tolist(),
+            hovertemplate = "Level=%{x}<br>Accuracy (%)=%{y}<br>Leeches=%{customdata}<extra></extra>",
+            marker_color = colors.colors["wanikani_blue"]["rgb"]
+        )],
+        layout = go.Layout(
+            xaxis = {"title": "Level", "dtick": 1},
+            yaxis = {"title": "Accuracy (%)", "range": [max(0, float(accuracy.min()) - 5), 100]}
+        )
+    )
+
+    return fig
+
+def format_percent(value):
+    """
+    Description
+        Formats a percentage for a table cell, "-" when there is no value.
+
+    Input
+        value: float; Percentage, NaN when unknown.
+
+    Output
+        text: string; Formatted percentage.
+
+    Example
+        format_percent(value = 96.123)
+
+        "96.1%"
+    """
+    return "-" if np.isnan(value) else f"{value:.1f}%"
+
+@mh.timed
+@cah.cached(ttl = render_ttl)
+def make_accuracy_table(by_type):
+    """
+    Description
+        Builds the table of meaning and reading accuracy, streaks and leeches per item type.
+
+    Input
+        by_type: dict; "by_type" of get_review_stats.
+
+    Output
+        df: pd.DataFrame; One row per item type.
+
+    Example
+        make_accuracy_table(by_type = review_stats["by_type"])
+    """
+    import pandas as pd
+
+    # df:
+    # | Item           | Meaning | Reading | Avg. Current Streak | Longest Streak | Leeches |
+    # |----------------|---------|---------|---------------------|----------------|---------|
+    # | Radical 部首    | 96.1%   | -       | 5.2                 | 31             | 0       |
+    # | ...            | ...     | ...     | ...                 | ...            | ...     |
+    df = pd.DataFrame({
+        "Item": [wanikani.item_labels[item] for item in wanikani.items],
+        "Meaning": [format_percent(value) for value in by_type["meaning_accuracy"]],
+        "Reading": [format_percent(value) for value in by_type["reading_accuracy"]],
+        "Avg. Current Streak": ["-" if np.isnan(value) else f"{value:.1f}" for value in by_type["mean_current_streak"]],
+        "Longest Streak": by_type["longest_streak"],
+        "Leeches": by_type["leeches"]
+    })
+
+    return df
+
+@mh.timed
+@cah.cached(ttl = render_ttl)
+def make_leeches_table(leeches):
+    """
+    Description
+        Builds the table of the items with the highest leech scores.
+
+    Input
+        leeches: list; "leeches" of get_review_stats.
+
+    Output
+        df: pd.DataFrame; One row per leech.
+
+    Example
+        make_leeches_table(leeches = review_stats["leeches"])
+    """
+    import pandas as pd
+
+    item_labels = wanikani.item_labels
+
+    df = pd.DataFrame({
+        "Item": [leech["characters"] or leech["meaning"] for leech in leeches],
+        "Meaning": [leech["meaning"] for leech in leeches],
+        "Type": [item_labels[wanikani.item_types[leech["type"]]] if leech["type"] else "-" for leech in leeches],
+        "Level": [leech["level"] or "-" for leech in leeches],
+        "Score": [round(leech["score"], 2) for leech in leeches]
+    })
+
+    return df
@@ -0,0 +1,311 @@
+from data import wanikani
+import helpers.fetchHelpers as fh
+import helpers.httpHelpers as hh
+import helpers.projectionHelpers as ph
+import helpers.subjectHelpers as sh
+import numpy as np
+
+column_names = (
+    "subject_id",
+    "meaning_correct",
+    "meaning_incorrect",
+    "meaning_max_streak",
+    "meaning_current_streak",
+    "reading_correct",
+    "reading_incorrect",
+    "reading_max_streak",
+    "reading_current_streak"
+)
+
+review_fields = {name: (f"data.{name}", np.int64) for name in column_names}
+review_fields["subject_type"] = ("data.subject_type", ph.category(*wanikani.subject_types))
+
+# Subject type code to index in wanikani.items (see wanikani.item_types).
+type_index = np.array(
+    [wanikani.items.index(wanikani.item_types[subject_type]) for subject_type in wanikani.subject_types],
+    dtype = np.int64
+)
+
+# Community leech score: incorrect answers weighed against the current streak. A score of 1 or more
+# means the item keeps being missed faster than it is being learned.
+leech_threshold = 1.0
+leech_exponent = 1.5
+
+def page_to_columns(records):
+    """
+    Description
+        Converts one page of review statistics into NumPy columns.
+
+    Input
+        records: list; Review statistic resources.
+
+    Output
+        columns: dict; One int64 array per name in column_names, plus "type" (index into wanikani.items, -1 if unknown).
+
+    Example
+        page_to_columns(records = page["data"])
+
+        {"subject_id": array([440, 441, ...]), "meaning_correct": array([12, 9, ...]), ..., "type": array([1, 1, ...])}
+    """
+    columns = ph.project(records, review_fields)
+
+    codes = columns.pop("subject_type")
+    columns["type"] = np.where(codes >= 0, type_index[np.maximum(codes, 0)], -1)
+
+    return columns
+
+def iter_review_columns(token):
+    """
+    Description
+        Yields the visible review statistics of a user as NumPy columns, one API page at a time.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        columns: generator; Output from page_to_columns for each page.
+
+    Example
+        for columns in iter_review_columns(token = token):
+            print(columns["meaning_correct"].sum())
+    """
+    for page in fh.iter_pages(token = token, url = hh.get_url("review_statistics"), params = {"hidden": "false"}):
+        if len(page["data"]) > 0:
+            yield page_to_columns(page["data"])
+
+def get_leech_scores(columns):
+    """
+    Description
+        Computes the leech score of each item: incorrect / current streak ** 1.5, for meaning and reading,
+        keeping the worse of the two.
+
+    Input
+        columns: dict; Output from page_to_columns.
+
+    Output
+        scores: np.ndarray; One float per item.
+
+    Example
+        get_leech_scores(columns = columns)
+
+        array([0.  , 1.41, 0.09, ...])
+    """
+    meaning = columns["meaning_incorrect"] / np.maximum(columns["meaning_current_streak"], 1) ** leech_exponent
+    reading = columns["reading_incorrect"] / np.maximum(columns["reading_current_streak"], 1) ** leech_exponent
+
+    scores = np.maximum(meaning, reading)
+
+    return scores
+
+def make_review_totals(top = 20):
+    """
+    Description
+        Creates the running totals that review statistics are aggregated into. Their size depends only on the
+        number of item types and levels, not on the number of items.
+
+    Input
+        top: int; Number of worst leeches to keep.
+
+    Output
+        totals: dict; Zeroed accumulators, see add_review_columns.
+
+    Example
+        make_review_totals(top = 20)
+    """
+    n_types = len(wanikani.items)
+    n_levels = max(wanikani.levels) + 1
+
+    totals = {
+        # [..., 0] meaning, [..., 1] reading
+        "type_correct": np.zeros((n_types, 2), dtype = np.int64),
+        "type_incorrect": np.zeros((n_types, 2), dtype = np.int64),
+        "type_items": np.zeros(n_types, dtype = np.int64),
+        "type_leeches": np.zeros(n_types, dtype = np.int64),
+        "type_current_streak": np.zeros(n_types, dtype = np.int64),
+        "type_longest_streak": np.zeros(n_types, dtype = np.int64),
+        "level_correct": np.zeros(n_levels, dtype = np.int64),
+        "level_incorrect": np.zeros(n_levels, dtype = np.int64),
+        "level_leeches": np.zeros(n_levels, dtype = np.int64),
+        "top": top,
+        "leech_ids": np.zeros(0, dtype = np.int64),
+        "leech_scores": np.zeros(0, dtype = np.float64)
+    }
+
+    return totals
+
+def add_review_columns(totals, columns, levels):
+    """
+    Description
+        Adds one page of review statistics to the running totals with vectorized operations.
+
+    Input
+        totals: dict; Output from make_review_totals, updated in place.
+        columns: dict; Output from page_to_columns.
+        levels: np.ndarray; Level of each item (0 if unknown).
+
+    Output
+        totals: dict; The updated totals.
+
+    Example
+        add_review_columns(totals = totals, columns = columns, levels = sh.lookup(catalog, columns["subject_id"])["level"])
+    """
+    known = columns["type"] >= 0
+    columns = {name: column[known] for name, column in columns.items()}
+    levels = np.asarray(levels, dtype = np.int64)[known]
+
+    types = columns["type"]
+    n_types = len(totals["type_items"])
+    n_levels = len(totals["level_correct"])
+
+    def bincount(index, weights, minlength):
+        return np.bincount(index, weights = weights, minlength = minlength).astype(np.int64)
+
+    for kind, prefix in enumerate(("meaning", "reading")):
+        totals["type_correct"][:, kind] += bincount(types, columns[f"{prefix}_correct"], n_types)
+        totals["type_incorrect"][:, kind] += bincount(types, columns[f"{prefix}_incorrect"], n_types)
+
+    correct = columns["meaning_correct"] + columns["reading_correct"]
+    incorrect = columns["meaning_incorrect"] + columns["reading_incorrect"]
+
+    # Radicals have no reading, so their streak is the meaning streak alone.
+    has_reading = columns["reading_correct"] + columns["reading_incorrect"] > 0
+    current_streak = np.where(
+        has_reading,
+        np.minimum(columns["meaning_current_streak"], columns["reading_current_streak"]),
+        columns["meaning_current_streak"]
+    )
+    longest_streak = np.maximum(columns["meaning_max_streak"], columns["reading_max_streak"])
+
+    scores = get_leech_scores(columns)
+    leech = scores >= leech_threshold
+
+    totals["type_items"] += np.bincount(types, minlength = n_types)
+    totals["type_leeches"] += np.bincount(types[leech], minlength = n_types)
+    totals["type_current_streak"] += bincount(types, current_streak, n_types)
+    np.maximum.at(totals["type_longest_streak"], types, longest_streak)
+
+    totals["level_correct"] += bincount(levels, correct, n_levels)
+    totals["level_incorrect"] += bincount(levels, incorrect, n_levels)
+    totals["level_leeches"] += np.bincount(levels[leech], minlength = n_levels)
+
+    # Keep only the worst leeches seen so far.
+    ids = np.concatenate([totals["leech_ids"], columns["subject_id"][leech]])
+    leech_scores = np.concatenate([totals["leech_scores"], scores[leech]])
+    order = np.argsort(-leech_scores, kind = "stable")[:totals["top"]]
+    totals["leech_ids"], totals["leech_scores"] = ids[order], leech_scores[order]
+
+    return totals
+
+def get_accuracy(correct, incorrect):
+    """
+    Description
+        Computes accuracy percentages, NaN where there were no answers.
+
+    Input
+        correct: np.ndarray; Correct answers.
+        incorrect: np.ndarray; Incorrect answers.
+
+    Output
+        accuracy: np.ndarray; Percentage of correct answers.
+
+    Example
+        get_accuracy(correct = np.array([9, 0]), incorrect = np.array([1, 0]))
+
+        array([90., nan])
+    """
+    answers = correct + incorrect
+
+    with np.errstate(invalid = "ignore", divide = "ignore"):
+        accuracy = np.where(answers > 0, 100 * correct / answers, np.nan)
+
+    return accuracy
+
+def summarize_review_totals(totals, catalog):
+    """
+    Description
+        Turns the running totals into accuracy, streak and leech statistics per item type and per level.
+
+    Input
+        totals: dict; Output from add_review_columns.
+        catalog: np.ndarray; Subject catalog, used to describe the leeches.
+
+    Output
+        stats: dict; "by_type" (arrays aligned with wanikani.items), "by_level" (arrays aligned with "level",
+            levels with answers only) and "leeches" (worst first).
+
+    Example
+        summarize_review_totals(totals = totals, catalog = catalog)
+
+        {
+            "by_type": {"accuracy": array([96.1, 88.4, 90.2]), "leeches": array([0, 14, 31]), ...},
+            "by_level": {"level": array([1, 2, ...]), "accuracy": array([97.5, 95.2, ...]), "leeches": array([0, 1, ...])},
+            "leeches": [{"subject_id": 2467, "characters": "一", "meaning": "One", "type": "vocabulary", "level": 1, "score": 2.3}, ...]
+        }
+    """
+    correct = totals["type_correct"]
+    incorrect = totals["type_incorrect"]
+    items = totals["type_items"]
+
+    with np.errstate(invalid = "ignore", divide = "ignore"):
+        mean_current_streak = np.where(items > 0, totals["type_current_streak"] / np.maximum(items, 1), np.nan)
+
+    answered = (totals["level_correct"] + totals["level_incorrect"]) > 0
+    answered[0] = False
+
+    subjects = sh.lookup(catalog, totals["leech_ids"])
+
+    stats = {
+        "by_type": {
+            "accuracy": get_accuracy(correct.sum(axis = 1), incorrect.sum(axis = 1)),
+            "meaning_accuracy": get_accuracy(correct[:, 0], incorrect[:, 0]),
+            "reading_accuracy": get_accuracy(correct[:, 1], incorrect[:, 1]),
+            "items": items,
+            "leeches": totals["type_leeches"],
+            "mean_current_streak": mean_current_streak,
+            "longest_streak": totals["type_longest_streak"]
+        },
+        "by_level": {
+            "level": np.flatnonzero(answered),
+            "accuracy": get_accuracy(totals["level_correct"], totals["level_incorrect"])[answered],
+            "leeches": totals["level_leeches"][answered]
+        },
+        "leeches": [
+            {
+                "subject_id": int(subject_id),
+                "characters": str(subject["characters"]),
+                "meaning": str(subject["meaning"]),
+                "type": wanikani.subject_types[subject["type"]] if subject["type"] >= 0 else None,
+                "level": int(subject["level"]),
+                "score": float(score)
+            }
+            for subject_id, subject, score in zip(totals["leech_ids"], subjects, totals["leech_scores"])
+        ]
+    }
+
+    return stats
+
+def get_review_stats(token, top = 20):
+    """
+    Description
+        Streams a user's review statistics page by page into the running totals and summarizes them.
+        Only one page of columns is held in memory at a time; levels come from the shared subject catalog.
+
+    Input
+        token: string; User supplied token.
+        top: int; Number of worst leeches to return.
+
+    Output
+        stats: dict; Output from summarize_review_totals.
+
+    Example
+        get_review_stats(token = token)
+    """
+    catalog = sh.get_catalog(token)
+    totals = make_review_totals(top = top)
+
+    for columns in iter_review_columns(token):
+        add_review_columns(totals, columns, sh.lookup(catalog, columns["subject_id"])["level"])
+
+    stats = summarize_review_totals(totals, catalog)
+
+    return stats
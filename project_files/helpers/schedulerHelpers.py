@@ -0,0 +1,282 @@
+import heapq
+import helpers.helpers as hp
+import helpers.metricsHelpers as mh
+import itertools
+import os
+import threading
+import time
+
+enabled = os.environ.get("WANIKANI_SCHEDULER", "1") != "0"
+
+# Wanikani allows 60 requests per minute per token. The RateLimit-* headers of each response override these.
+rate_limit = int(os.environ.get("WANIKANI_RATE_LIMIT", 60))
+rate_period = 60.0
+
+# Slots bulk requests leave free, so an interactive request never waits behind a long pagination.
+interactive_reserve = 2
+
+priorities = {"interactive": 0, "bulk": 1}
+
+_buckets = {}
+_condition = threading.Condition()
+_sequence = itertools.count()
+
+def get_bucket(token_digest, now):
+    """
+    Description
+        Returns the token bucket of an API token, creating a full one on first use. Caller must hold the condition.
+
+    Input
+        token_digest: string; SHA-256 digest of the user supplied token.
+        now: float; time.monotonic() value.
+
+    Output
+        bucket: dict; "limit", "tokens", "updated" (monotonic time of the last refill), the API's current window
+            ("window_remaining" requests until "window_reset", None before the first response), "blocked_until"
+            (no request before this monotonic time), "waiting" (heap of queued requests), "in_flight" and counters.
+
+    Example
+        get_bucket(token_digest = hp.get_token_digest(token), now = time.monotonic())
+    """
+    bucket = _buckets.get(token_digest)
+
+    if bucket is None:
+        bucket = {
+            "limit": rate_limit,
+            "tokens": float(rate_limit),
+            "updated": now,
+            "window_remaining": None,
+            "window_reset": 0.0,
+            "blocked_until": 0.0,
+            "waiting": [],
+            "in_flight": 0,
+            "requests": 0,
+            "throttled": 0
+        }
+        _buckets[token_digest] = bucket
+
+    return bucket
+
+def refill(bucket, now):
+    """
+    Description
+        Adds the tokens earned since the last refill, at limit per rate_period, up to limit.
+
+    Input
+        bucket: dict; Output from get_bucket.
+        now: float; time.monotonic() value.
+
+    Output
+        None
+
+    Example
+        refill(bucket = bucket, now = time.monotonic())
+    """
+    bucket["tokens"] = min(float(bucket["limit"]), bucket["tokens"] + (now - bucket["updated"]) * bucket["limit"] / rate_period)
+    bucket["updated"] = now
+
+    if bucket["window_remaining"] is not None and now >= bucket["window_reset"]:
+        bucket["window_remaining"] = None
+
+    return None
+
+def get_available(bucket):
+    """
+    Description
+        Returns how many requests may be sent right now: the local bucket, capped by what the API said is
+        left in its current window.
+
+    Input
+        bucket: dict; Output from get_bucket, freshly refilled.
+
+    Output
+        available: float; Number of requests.
+
+    Example
+        get_available(bucket = bucket)
+
+        41.5
+    """
+    available = bucket["tokens"]
+
+    if bucket["window_remaining"] is not None:
+        available = min(available, float(bucket["window_remaining"]))
+
+    return available
+
+def acquire(token, priority = "interactive"):
+    """
+    Description
+        Waits until a request for this token may be sent without exceeding the rate limit. Queued requests
+        are served by priority, then in arrival order; bulk requests leave interactive_reserve slots free.
+
+    Input
+        token: string; User supplied token.
+        priority: string; "interactive" (a user is waiting on this one request) or "bulk" (pagination).
+
+    Output
+        waited: float; Seconds spent in the queue.
+
+    Example
+        acquire(token = token, priority = "bulk")
+
+        0.0
+    """
+    if not enabled:
+        return 0.0
+
+    token_digest = hp.get_token_digest(token)
+    reserve = interactive_reserve if priority == "bulk" else 0
+    start = time.monotonic()
+
+    with _condition:
+        bucket = get_bucket(token_digest, start)
+        entry = (priorities[priority], next(_sequence))
+        heapq.heappush(bucket["waiting"], entry)
+
+        try:
+            while True:
+                now = time.monotonic()
+                refill(bucket, now)
+
+                available = get_available(bucket)
+
+                if bucket["waiting"][0] == entry and now >= bucket["blocked_until"] and available >= 1 + reserve:
+                    bucket["tokens"] -= 1
+                    if bucket["window_remaining"] is not None:
+                        bucket["window_remaining"] -= 1
+                    bucket["in_flight"] += 1
+                    bucket["requests"] += 1
+                    break
+
+                # Sleep until the next token is earned, the API window resets or the block ends;
+                # new arrivals and header updates wake us earlier.
+                if bucket["window_remaining"] is not None and bucket["window_remaining"] < 1 + reserve:
+                    wait = bucket["window_reset"] - now
+                else:
+                    wait = (1 + reserve - bucket["tokens"]) * rate_period / bucket["limit"]
+                wait = max(wait, bucket["blocked_until"] - now, 0.001)
+                _condition.wait(timeout = wait)
+        finally:
+            bucket["waiting"].remove(entry)
+            heapq.heapify(bucket["waiting"])
+            _condition.notify_all()
+
+    waited = time.monotonic() - start
+    mh.record_timing(f"scheduler.wait.{priority}", waited)
+
+    return waited
+
+def update(token, response):
+    """
+    Description
+        Marks a request sent after acquire as finished, and corrects the token's bucket with what the API
+        reported: RateLimit-Limit, RateLimit-Remaining and RateLimit-Reset, or Retry-After on a 429.
+        Keeps the bucket in step with requests made by other processes using the same token.
+
+    Input
+        token: string; User supplied token.
+        response: requests.Response or None; Response just received, None if the request failed without one.
+
+    Output
+        None
+
+    Example
+        update(token = token, response = response)
+    """
+    if not enabled:
+        return None
+
+    headers = {} if response is None else response.headers
+    now = time.monotonic()
+
+    with _condition:
+        bucket = get_bucket(hp.get_token_digest(token), now)
+        bucket["in_flight"] = max(0, bucket["in_flight"] - 1)
+        refill(bucket, now)
+
+        try:
+            if "RateLimit-Limit" in headers:
+                bucket["limit"] = max(1, int(headers["RateLimit-Limit"]))
+
+            if "RateLimit-Remaining" in headers and "RateLimit-Reset" in headers:
+                # Requests still in flight may not be counted in this response yet.
+                remaining = int(headers["RateLimit-Remaining"]) - bucket["in_flight"]
+                window_reset = now + max(0.0, float(headers["RateLimit-Reset"]) - time.time())
+
+                # Within a window, requests sent after this response was counted are already subtracted
+                # locally, so keep the lower value. A later reset time means a new window has started.
+                if bucket["window_remaining"] is None or window_reset > bucket["window_reset"] + 1:
+                    bucket["window_remaining"] = remaining
+                    bucket["window_reset"] = window_reset
+                else:
+                    bucket["window_remaining"] = min(bucket["window_remaining"], remaining)
+
+            if response is not None and response.status_code == 429:
+                bucket["throttled"] += 1
+                bucket["tokens"] = 0.0
+                mh.increment("scheduler.throttled")
+
+                if "Retry-After" in headers:
+                    bucket["blocked_until"] = max(bucket["blocked_until"], now + float(headers["Retry-After"]))
+        except ValueError:
+            pass
+
+        _condition.notify_all()
+
+    return None
+
+def get_scheduler_stats():
+    """
+    Description
+        Returns the state of every token bucket, keyed by the first characters of the token digest.
+
+    Input
+        None
+
+    Output
+        stats: dict; Per bucket: "limit", "tokens" available now, "queued" requests, "requests" sent and "throttled" (429s).
+
+    Example
+        get_scheduler_stats()
+
+        {"9f86d081": {"limit": 60, "tokens": 41.5, "queued": 0, "requests": 27, "throttled": 0}}
+    """
+    now = time.monotonic()
+    stats = {}
+
+    with _condition:
+        for token_digest, bucket in _buckets.items():
+            refill(bucket, now)
+            stats[token_digest[:8]] = {
+                "limit": bucket["limit"],
+                "tokens": round(get_available(bucket), 1),
+                "queued": len(bucket["waiting"]),
+                "requests": bucket["requests"],
+                "throttled": bucket["throttled"]
+            }
+
+    return stats
+
+def reset(enable = False):
+    """
+    Description
+        Drops every token bucket and turns pacing on or off. Benchmarks that measure something other than the
+        rate limit call it first, so their requests are neither paced nor counted against an earlier run.
+
+    Input
+        enable: bool; Whether requests are paced from now on (default: False).
+
+    Output
+        None
+
+    Example
+        reset()
+    """
+    global enabled
+
+    with _condition:
+        enabled = enable
+        _buckets.clear()
+
+    return None
@@ -0,0 +1,262 @@
+from data import wanikani
+import helpers.helpers as hp
+import helpers.metricsHelpers as mh
+import numpy as np
+import os
+import threading
+
+snapshot_dir_name = "snapshots"
+
+# Each snapshot is one row of int32 values: the day (days since 1970-01-01 in the dashboard timezone) followed
+# by the count matrix of get_learned_counts, flattened (10 SRS stages x number of items).
+count_shape = (10, len(wanikani.items))
+row_width = 1 + count_shape[0] * count_shape[1]
+
+# New snapshots are appended to a small log; once it holds this many rows it is folded into the base file.
+compact_rows = 32
+
+_lock = threading.Lock()
+
+def get_snapshot_paths(token):
+    """
+    Description
+        Returns where the snapshots of a user are stored.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        base_path: string; Compacted snapshots, one per day, stored column by column (see compact_snapshots).
+        log_path: string; Append-only log of the snapshots recorded since the last compaction.
+
+    Example
+        get_snapshot_paths(token = token)
+
+        ("~/.cache/wanikani-stats-dashboard/snapshots/9f86d081884c7d65.npy", "~/.cache/wanikani-stats-dashboard/snapshots/9f86d081884c7d65.log")
+    """
+    snapshot_dir = os.path.join(hp.get_data_dir(), snapshot_dir_name)
+    os.makedirs(snapshot_dir, exist_ok = True)
+
+    name = hp.get_token_digest(token)[:16]
+
+    return os.path.join(snapshot_dir, f"{name}.npy"), os.path.join(snapshot_dir, f"{name}.log")
+
+def get_day(timestamp = None, timezone = "America/Los_Angeles"):
+    """
+    Description
+        Converts a timestamp to the day number snapshots are keyed by.
+
+    Input
+        timestamp: datetime or None; Timestamp, now if None.
+        timezone: string; Timezone the day starts in.
+
+    Output
+        day: int; Days since 1970-01-01.
+
+    Example
+        get_day()
+
+        20744
+    """
+    timestamp = hp.get_current_timestamp(timezone) if timestamp is None else timestamp.astimezone(hp.get_timezone(timezone))
+
+    day = int(np.datetime64(timestamp.date(), "D").astype(np.int64))
+
+    return day
+
+def read_log(log_path):
+    """
+    Description
+        Reads the rows of a snapshot log. A row cut short by a crash during an append is ignored.
+
+    Input
+        log_path: string; Path of the log.
+
+    Output
+        rows: np.ndarray; int32 array of shape (number of rows, row_width), in append order.
+
+    Example
+        read_log(log_path = log_path)
+    """
+    try:
+        values = np.fromfile(log_path, dtype = np.int32)
+    except FileNotFoundError:
+        values = np.zeros(0, dtype = np.int32)
+
+    rows = values[:len(values) // row_width * row_width].reshape(-1, row_width)
+
+    return rows
+
+def read_base(base_path):
+    """
+    Description
+        Memory-maps the compacted snapshots.
+
+    Input
+        base_path: string; Path of the base file.
+
+    Output
+        columns: np.ndarray; int32 array of shape (row_width, number of days): columns[0] holds the days in
+            ascending order, columns[1:] the flattened counts of each day.
+
+    Example
+        read_base(base_path = base_path)
+    """
+    try:
+        columns = np.load(base_path, mmap_mode = "r")
+    except FileNotFoundError:
+        columns = np.zeros((row_width, 0), dtype = np.int32)
+
+    return columns
+
+def merge_rows(columns, rows):
+    """
+    Description
+        Merges logged rows into compacted columns, keeping the last snapshot of each day.
+
+    Input
+        columns: np.ndarray; Output from read_base.
+        rows: np.ndarray; Output from read_log.
+
+    Output
+        merged: np.ndarray; Columns in the read_base layout, one per day, sorted by day.
+
+    Example
+        merge_rows(columns = read_base(base_path), rows = read_log(log_path))
+    """
+    if len(rows) == 0:
+        return np.asarray(columns)
+
+    combined = np.concatenate([np.asarray(columns), rows.T], axis = 1)
+
+    # Later rows win: a stable sort keeps append order within a day, then the last row of each day is kept.
+    order = np.argsort(combined[0], kind = "stable")
+    days = combined[0][order]
+    last = np.append(days[1:] != days[:-1], True)
+
+    merged = np.ascontiguousarray(combined[:, order[last]])
+
+    return merged
+
+@mh.timed
+def compact_snapshots(token):
+    """
+    Description
+        Folds the log of a user into the base file and starts an empty log. The base keeps one snapshot per
+        day and is stored column by column, so a date range is a binary search on the day column followed by
+        contiguous slices. The log is renamed before it is read, so snapshots appended meanwhile go to a new log.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        days: int; Number of days in the base after compaction.
+
+    Example
+        compact_snapshots(token = token)
+
+        412
+    """
+    base_path, log_path = get_snapshot_paths(token)
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+    with _lock:
+        try:
+            os.replace(log_path, log_path + suffix)
+        except FileNotFoundError:
+            return read_base(base_path).shape[1]
+
+        merged = merge_rows(read_base(base_path), read_log(log_path + suffix))
+
+        with open(base_path + suffix, "wb") as f:
+            np.save(f, merged)
+        os.replace(base_path + suffix, base_path)
+        os.remove(log_path + suffix)
+
+    mh.increment("snapshots.compactions")
+
+    return merged.shape[1]
+
+def record_snapshot(token, counts, timestamp = None):
+    """
+    Description
+        Appends the count matrix of a user to the snapshot log, unless it equals the last recorded snapshot
+        of the same day. Called every time get_learned_counts computes fresh counts, so the last snapshot of a
+        day is the state at the end of that day's last visit.
+
+    Input
+        token: string; User supplied token.
+        counts: np.ndarray; Count matrix from get_learned_counts, shape (10, number of items).
+        timestamp: datetime or None; When the counts were taken, now if None.
+
+    Output
+        recorded: bool; True if a row was appended.
+
+    Example
+        record_snapshot(token = token, counts = counts)
+
+        True
+    """
+    base_path, log_path = get_snapshot_paths(token)
+
+    row = np.empty(row_width, dtype = np.int32)
+    row[0] = get_day(timestamp)
+    row[1:] = np.asarray(counts).reshape(-1)
+
+    with _lock:
+        rows = read_log(log_path)
+
+        if len(rows) > 0:
+            last = rows[-1]
+        else:
+            columns = read_base(base_path)
+            last = columns[:, -1] if columns.shape[1] > 0 else None
+
+        if last is not None and np.array_equal(last, row):
+            return False
+
+        # A single write of one row to a file opened for appending, so concurrent appends never interleave.
+        fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, row.tobytes())
+        finally:
+            os.close(fd)
+
+    mh.increment("snapshots.recorded")
+
+    if len(rows) + 1 >= compact_rows:
+        compact_snapshots(token)
+
+    return True
+
+@mh.timed
+def get_snapshots(token, start = None, end = None):
+    """
+    Description
+        Returns the daily snapshots of a user in a date range, read from local files only (no API calls).
+
+    Input
+        token: string; User supplied token.
+        start: int or None; First day (see get_day), None for the first snapshot.
+        end: int or None; Last day, inclusive, None for the last snapshot.
+
+    Output
+        days: np.ndarray; datetime64[D] day of each snapshot, ascending.
+        counts: np.ndarray; Count matrix of each day, shape (number of days, 10, number of items).
+
+    Example
+        get_snapshots(token = token, start = get_day() - 30)
+
+        (array(['2026-09-18', ..., '2026-10-18'], dtype='datetime64[D]'), array([[[0, 0, 0], ...]]))
+    """
+    base_path, log_path = get_snapshot_paths(token)
+
+    columns = merge_rows(read_base(base_path), read_log(log_path))
+
+    first = 0 if start is None else np.searchsorted(columns[0], start, side = "left")
+    last = columns.shape[1] if end is None else np.searchsorted(columns[0], end, side = "right")
+
+    days = columns[0, first:last].astype("datetime64[D]")
+    counts = np.ascontiguousarray(columns[1:, first:last].T).reshape((-1,) + count_shape)
+
+    return days, counts
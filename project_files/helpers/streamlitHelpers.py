@@ -1,11 +1,24 @@
 from data import colors
-import helpers.helpers as hp
+import helpers.cacheHelpers as cah
+import helpers.flightHelpers as flh
+import helpers.httpHelpers as hh
+import helpers.levelHelpers as lh
+import helpers.metricsHelpers as mh
+import helpers.renderHelpers as rdh
+import helpers.schedulerHelpers as sch
 import helpers.wanikaniHelpers as wkh
 import numpy as np
-import pandas as pd
-import plotly.express as px
 import streamlit as st
 
+# pandas and plotly take most of the import time of this module, so they are imported inside the functions
+# that build charts and tables (here and in renderHelpers). The token prompt and the invalid token message
+# render without them.
+
+# Sections with their own widgets run as fragments: changing one of their widgets reruns only that section,
+# not the whole script (token check, other sections and charts).
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+@mh.timed
 def get_color(color, type):
     """
     Description
@@ -25,6 +38,7 @@ def get_color(color, type):
 
     return color_code
 
+@mh.timed
 def insert_space(length = 40, color = 238):
     """
     Description
@@ -40,10 +54,14 @@ def insert_space(length = 40, color = 238):
     Example
         insert_page_break(length = 40, color = 238)
     """
-    st.image(np.full((length, 1, 3), color))
+    st.markdown(
+        f'<div style="height:{length}px;background-color:rgb({color},{color},{color})"></div>',
+        unsafe_allow_html = True
+    )
 
     return None
 
+@mh.timed
 def get_token():
     """
     Description
@@ -71,6 +89,7 @@ def get_token():
 
     return token
 
+@mh.timed
 def get_user_data(token):
     """
     Description
@@ -95,6 +114,26 @@ def get_user_data(token):
 
     return user_data
 
+@mh.timed
+def start_prefetch(token):
+    """
+    Description
+        Starts fetching the data of every section in the background once the token is known to be valid.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        None
+
+    Example
+        start_prefetch(token = token)
+    """
+    wkh.prefetch(token)
+
+    return None
+
+@mh.timed
 def display_token_error_message():
     """
     Description
@@ -113,6 +152,7 @@ def display_token_error_message():
 
     return None
 
+@mh.timed
 def display_welcome_message(user_data):
     """
     Description
@@ -135,6 +175,7 @@ def display_welcome_message(user_data):
 
     return None
 
+@mh.timed
 def display_join_date(user_data):
     """
     Description
@@ -157,6 +198,7 @@ def display_join_date(user_data):
 
     return None
 
+@mh.timed
 def display_items_learned(token, srs_stage_start = 5, srs_stage_end = 9):
     """
     Description
@@ -178,17 +220,20 @@ def display_items_learned(token, srs_stage_start = 5, srs_stage_end = 9):
 
     # items: ("radical", "kanji", "vocabulary")
     # item_labels: {'radical': 'Radical 部首', 'kanji': 'Kanji 漢字', 'vocabulary': 'Vocabulary 単語'}
-    # counts: {1: {"radical": 0, "kanji": 0, "vocabulary": 0}, ..., 10: {"radical": 0, "kanji": 0, "vocabulary": 0}}
+    # counts: array of shape (10, 3), counts[srs_stage, i] is the number of items[i] at that SRS stage
     items, item_labels, counts = wkh.get_learned_counts(token)
 
-    for col, item in zip(st.columns(3), items):
+    learned = counts[srs_stage_start:srs_stage_end + 1].sum(axis = 0)
+
+    for col, item, value in zip(st.columns(3), items, learned):
         col.metric(
             label = item_labels[item],
-            value = sum([counts[srs_stage][item] for srs_stage in range(srs_stage_start, srs_stage_end + 1)])
+            value = int(value)
         )
 
     return None
 
+@mh.timed
 def get_breakdown_type():
     """
     Description
@@ -207,6 +252,7 @@ def get_breakdown_type():
 
     return breakdown_type
 
+@mh.timed
 def display_items_breakdown(token, breakdown_type):
     """
     Description
@@ -222,29 +268,16 @@ def display_items_breakdown(token, breakdown_type):
     Example
         display_items_breakdown(token = token, breakdown_type = breakdown_type)
     """
-    # counts: {1: {"radical": 0, "kanji": 0, "vocabulary": 0}, ..., 10: {"radical": 0, "kanji": 0, "vocabulary": 0}}
+    # counts: array of shape (10, 3), counts[srs_stage, i] is the number of items[i] at that SRS stage
     _, _, counts = wkh.get_learned_counts(token)
 
     if breakdown_type == "Bar Chart":
-        # df:
-        # | Item            | Stage      | Count |
-        # |-----------------|------------|-------|
-        # | Radical 部首     | Apprentice | 5     |
-        # | Kanji 漢字       | Apprentice | 10    |
-        # | Vocabulary 単語  | Apprentice | 20    |
-        # | ...             | ...        | ...   |
-        df = wkh.get_item_breakdown(counts, breakdown_type)
-
-        color_discrete_map = {}
-        for stage in df["Stage"].unique():
-            color_discrete_map[stage] = get_color(stage.lower(), "rgb")
-
-        fig = px.bar(
-            data_frame = df, x = "Item", y = "Count", color = "Stage",
-            barmode = "group", color_discrete_map = color_discrete_map
-        )
+        # Built once per distinct counts, then served from the cache on every rerun.
+        with mh.timer("figure.items_breakdown"):
+            fig = rdh.make_items_breakdown_figure(counts)
 
-        st.plotly_chart(fig)
+        with mh.timer("render.items_breakdown"):
+            st.plotly_chart(fig)
 
     elif breakdown_type == "Table":
         # df:
@@ -256,7 +289,8 @@ def display_items_breakdown(token, breakdown_type):
         # | Enlightened | 38           | 136        | 470           |
         # | Burned      | 225          | 300        | 901           |
         # | All         | 289          | 561        | 1681          |
-        df = wkh.get_item_breakdown(counts, breakdown_type)
+        with mh.timer("figure.items_breakdown_table"):
+            df = rdh.make_items_breakdown_table(counts)
 
         # Inject CSS with Markdown to hide table index
         hide_row_index = """
@@ -266,38 +300,691 @@ def display_items_breakdown(token, breakdown_type):
             </style>
         """
         st.markdown(hide_row_index, unsafe_allow_html = True)
-        st.table(df)
+
+        with mh.timer("render.items_breakdown_table"):
+            st.table(df)
+
+    return None
+
+@fragment
+@mh.timed
+def display_items_breakdown_section(token):
+    """
+    Description
+        Displays the breakdown type radio buttons with the breakdown they select. Runs as a fragment, so
+        switching between "Bar Chart" and "Table" only reruns this section.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        None
+
+    Example
+        display_items_breakdown_section(token = token)
+    """
+    breakdown_type = get_breakdown_type()
+
+    display_items_breakdown(token, breakdown_type)
+
+    write_metrics()
+
+    return None
+
+@mh.timed
+def get_forecast_range():
+    """
+    Description
+        Get the forecast range from the user using radio button selections.
+
+    Input
+        None
+
+    Output
+        forecast_range: string; The user-selected range. Possible values: "Next 24 Hours", "Next 7 Days"
+
+    Example
+        get_forecast_range()
+    """
+    forecast_range = st.radio(label = "Review Forecast", options = ["Next 24 Hours", "Next 7 Days"], index = 0, horizontal = True)
+
+    return forecast_range
+
+@mh.timed
+def display_review_forecast(token, forecast_range, timezone = "America/Los_Angeles"):
+    """
+    Description
+        Displays a stacked bar chart of upcoming reviews by item type, per hour or per day.
+        Reviews that are already available are counted in the first bar.
+
+    Input
+        token: string; User supplied token.
+        forecast_range: string; Output from get_forecast_range.
+        timezone: string; Timezone to show times in.
+
+    Output
+        None
+
+    Example
+        display_review_forecast(token = token, forecast_range = "Next 7 Days")
+    """
+    import pandas as pd
+
+    if forecast_range == "Next 7 Days":
+        bin_hours, bins, time_format = 24, 7, "%a %b %d"
+    else:
+        bin_hours, bins, time_format = 1, 24, "%a %H:%M"
+
+    # forecast: array of shape (bins, 3), forecast[i, j] is the number of items[j] reviews in bin i
+    starts, forecast = wkh.get_review_forecast(token, bin_hours = bin_hours, bins = bins, timezone = timezone)
+
+    st.caption(f"{int(forecast.sum())} reviews, {int(forecast[0].sum())} available now or within the first {'day' if bin_hours == 24 else 'hour'}.")
+
+    times = tuple(pd.to_datetime(starts).tz_localize("UTC").tz_convert(timezone).strftime(time_format))
+
+    with mh.timer("figure.review_forecast"):
+        fig = rdh.make_review_forecast_figure(times, forecast)
+
+    with mh.timer("render.review_forecast"):
+        st.plotly_chart(fig)
+
+    return None
+
+@fragment
+@mh.timed
+def display_review_forecast_section(token):
+    """
+    Description
+        Displays the forecast range radio buttons with the forecast they select. Runs as a fragment, so
+        changing the range only reruns this section.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        None
+
+    Example
+        display_review_forecast_section(token = token)
+    """
+    forecast_range = get_forecast_range()
+
+    display_review_forecast(token, forecast_range)
+
+    write_metrics()
+
+    return None
+
+@mh.timed
+def get_trend_range():
+    """
+    Description
+        Get the range of the progress trend from the user using radio button selections.
+
+    Input
+        None
+
+    Output
+        trend_range: string; The user-selected range. Possible values: "Last 30 Days", "Last Year", "All Time"
+
+    Example
+        get_trend_range()
+    """
+    trend_range = st.radio(label = "Progress (Guru+)", options = ["Last 30 Days", "Last Year", "All Time"], index = 0, horizontal = True)
+
+    return trend_range
+
+@mh.timed
+def display_progress_trend(token, trend_range):
+    """
+    Description
+        Displays a line chart of the items learned (Guru+) on each day the dashboard was visited.
+        Drawn from the snapshots recorded by get_learned_counts, so changing the range makes no API calls.
+
+    Input
+        token: string; User supplied token.
+        trend_range: string; Output from get_trend_range.
+
+    Output
+        None
+
+    Example
+        display_progress_trend(token = token, trend_range = "Last 30 Days")
+    """
+    days = {"Last 30 Days": 30, "Last Year": 365, "All Time": None}[trend_range]
+
+    # trend: array of shape (number of days, 3), trend[i, j] is the number of items[j] at Guru+ on dates[i]
+    dates, trend = wkh.get_progress_trend(token, days = days)
+
+    if len(dates) < 2:
+        st.caption("A snapshot of your progress is saved once a day when you visit; the trend appears from the second day.")
+
+        return None
+
+    with mh.timer("figure.progress_trend"):
+        fig = rdh.make_progress_trend_figure(dates, trend)
+
+    with mh.timer("render.progress_trend"):
+        st.plotly_chart(fig)
+
+    return None
+
+@fragment
+@mh.timed
+def display_progress_trend_section(token):
+    """
+    Description
+        Displays the trend range radio buttons with the chart they select. Runs as a fragment, so changing
+        the range only reruns this section.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        None
+
+    Example
+        display_progress_trend_section(token = token)
+    """
+    trend_range = get_trend_range()
+
+    display_progress_trend(token, trend_range)
+
+    write_metrics()
+
+    return None
+
+@mh.timed
+def get_level_filters(max_level):
+    """
+    Description
+        Get the level range and stage groups to drill down into from the user.
+
+    Input
+        max_level: int; Highest level offered by the slider.
+
+    Output
+        level_range: tuple; First and last level, inclusive.
+        stages: list; Selected stage groups from wanikani.stages.
+
+    Example
+        get_level_filters(max_level = 20)
+    """
+    _, _, all_stages, _ = wkh.get_standard_data()
+
+    level_range = st.slider(label = "Levels", min_value = 1, max_value = max(2, max_level), value = (1, max(2, max_level)))
+    stages = st.multiselect(label = "Stages", options = list(all_stages), default = list(all_stages[1:]))
+
+    return level_range, stages
+
+@mh.timed
+def display_level_breakdown(token, level_range, stages):
+    """
+    Description
+        Displays the number of items per item type in a level range and set of stage groups, followed by a
+        stacked bar chart of those items per level. Both are sliced out of the cube of get_level_counts, so
+        changing the filters makes no API calls.
+
+    Input
+        token: string; User supplied token.
+        level_range: tuple; First and last level, inclusive.
+        stages: list; Stage groups to count.
+
+    Output
+        None
+
+    Example
+        display_level_breakdown(token = token, level_range = (1, 10), stages = ["Guru", "Master"])
+    """
+    items, item_labels, all_stages, srs_stages = wkh.get_standard_data()
+
+    # cube: array of shape (60, 3, 10), cube[level - 1, i, srs_stage] is the number of items[i] of that level at that SRS stage
+    cube = wkh.get_level_counts(token)
+
+    selected = np.zeros(cube.shape[2], dtype = bool)
+    for stage in stages:
+        selected[srs_stages[stage]["start"]:srs_stages[stage]["end"] + 1] = True
+
+    # level_counts: array of shape (number of levels in range, 3)
+    level_counts = cube[level_range[0] - 1:level_range[1], :, selected].sum(axis = 2)
+
+    for col, item, value in zip(st.columns(3), items, level_counts.sum(axis = 0)):
+        col.metric(
+            label = item_labels[item],
+            value = int(value)
+        )
+
+    with mh.timer("figure.level_breakdown"):
+        fig = rdh.make_level_breakdown_figure(np.arange(level_range[0], level_range[1] + 1), level_counts)
+
+    with mh.timer("render.level_breakdown"):
+        st.plotly_chart(fig)
+
+    return None
+
+@fragment
+@mh.timed
+def display_level_breakdown_section(token, max_level):
+    """
+    Description
+        Displays the level and stage filters with the counts they select. Runs as a fragment, so moving a
+        filter only reruns this section.
+
+    Input
+        token: string; User supplied token.
+        max_level: int; Highest level offered by the slider, e.g. the user's current level.
+
+    Output
+        None
+
+    Example
+        display_level_breakdown_section(token = token, max_level = 20)
+    """
+    st.subheader("Items by Level")
+
+    level_range, stages = get_level_filters(max_level)
+
+    display_level_breakdown(token, level_range, stages)
+
+    write_metrics()
+
+    return None
+
+@mh.timed
+def get_levels(token):
+    """
+    Description
+        Gets the user's level progressions.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        levels: dict; Aligned arrays of level, start and pass times (see levelHelpers.build_progressions).
+
+    Example
+        get_levels(token = token)
+    """
+    levels = wkh.get_levels(token)
+
+    return levels
+
+@mh.timed
+def display_level_up_stats(levels):
+    """
+    Description
+        Displays summary statistics of the user's level-up times across 3 columns.
+
+        | col1     | col2     | col3               |
+        |----------|----------|--------------------|
+        | average  | shortest | standard deviation |
+        | median   | longest  | variance           |
+
+    Input
+        levels: dict; Output from get_levels.
+
+    Output
+        None
+
+    Example
+        display_level_up_stats(levels = levels)
+    """
+    st.subheader("Level-Up Time Statistics")
+    st.caption("Time (days) between level start (not unlocked) to level passed. Levels in progress are not included.")
+
+    level_up_stats = lh.get_level_up_stats(levels)
+
+    def format_days(days):
+        return "-" if days is None else f"{days:.1f}"
+
+    col1, col2, col3 = st.columns(3)
+
+    col1.metric(label = "Average", value = format_days(level_up_stats["mean"]))
+    col1.metric(label = "Median", value = format_days(level_up_stats["median"]))
+
+    col2.metric(label = "Shortest", value = format_days(level_up_stats["min"]))
+    col2.metric(label = "Longest", value = format_days(level_up_stats["max"]))
+
+    col3.metric(label = "Standard Deviation", value = format_days(level_up_stats["standard_deviation"]))
+    col3.metric(label = "Variance", value = format_days(level_up_stats["variance"]))
 
     return None
 
+@mh.timed
 def display_level_up_times_chart(levels):
     """
-    ...
+    Description
+        Displays a bar chart of the time spent on each level. The level in progress is drawn in pink.
+
+    Input
+        levels: dict; Output from get_levels.
+
+    Output
+        None
+
+    Example
+        display_level_up_times_chart(levels = levels)
     """
-    x = sorted([key for key in levels.keys() if levels[key]["elapsed_time"] is not None])
-    y = [round(hp.seconds_to_days(levels[l]["elapsed_time"].total_seconds()), 1) for l in x]
+    elapsed_days, in_progress = lh.get_elapsed_days(levels)
+    started = ~np.isnan(elapsed_days)
+
+    # Rounded as displayed, so the time of the level in progress only invalidates the figure when the bar changes.
+    with mh.timer("figure.level_up_times"):
+        fig = rdh.make_level_up_times_figure(
+            levels["level"][started],
+            np.round(elapsed_days[started], 1),
+            in_progress[started]
+        )
+
+    with mh.timer("render.level_up_times"):
+        st.plotly_chart(fig)
 
-    df = pd.DataFrame({
-        "level": x,
-        "time": y
-    })
+    return None
 
-    fig = px.bar(
-        data_frame = df,
-        x = "level",
-        y = "time",
-        labels = {
-            "level": "Level",
-            "time": "Level-Up Time (Days)"
-        }
-    ).update_xaxes(
-        dtick = 1
-    ).update_traces(
-        marker_color='rgb(72,169,248)'
+@mh.timed
+def display_level_stats(levels):
+    """
+    Description
+        Lets the user pick a level and displays the time spent on it compared to the previous level.
+
+    Input
+        levels: dict; Output from get_levels.
+
+    Output
+        None
+
+    Example
+        display_level_stats(levels = levels)
+    """
+    st.subheader("Individual Level Statistics")
+
+    started = levels["level"][~np.isnat(levels["started_at"])]
+
+    if len(started) == 0:
+        st.caption("No levels started yet.")
+
+        return None
+
+    selected_level = st.selectbox(
+        label = "Select a level.",
+        options = sorted(started.tolist(), reverse = True),
+        index = 0
     )
 
-    return fig
+    level_stats = lh.get_level_stats(selected_level = selected_level, progressions = levels)
+
+    col1, col2 = st.columns(2)
+
+    col1.metric(
+        label = "Level",
+        value = level_stats["level"]
+    )
+
+    delta = level_stats["delta"]
+    col2.metric(
+        label = "Days on level (in progress)" if level_stats["in_progress"] else "Days on level",
+        value = level_stats["time_on_level"],
+        delta = None if delta is None else f'{delta:.1f} vs. level {level_stats["previous_level"]}',
+        delta_color = level_stats["delta_color"]
+    )
+
+    return None
+
+@fragment
+@mh.timed
+def display_level_stats_section(levels):
+    """
+    Description
+        Displays the individual level statistics. Runs as a fragment, so picking another level only reruns
+        this section.
+
+    Input
+        levels: dict; Output from get_levels.
+
+    Output
+        None
+
+    Example
+        display_level_stats_section(levels = levels)
+    """
+    display_level_stats(levels)
+
+    write_metrics()
+
+    return None
+
+@mh.timed
+def get_review_stats(token):
+    """
+    Description
+        Gets the user's accuracy, streak and leech statistics.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        review_stats: dict; Output from reviewHelpers.get_review_stats.
+
+    Example
+        get_review_stats(token = token)
+    """
+    review_stats = wkh.get_review_stats(token)
+
+    return review_stats
+
+@mh.timed
+def display_accuracy_stats(review_stats):
+    """
+    Description
+        Displays the answer accuracy of each item type across 3 columns, followed by a table of meaning and
+        reading accuracy, streaks and leeches per item type.
+
+    Input
+        review_stats: dict; Output from get_review_stats.
+
+    Output
+        None
+
+    Example
+        display_accuracy_stats(review_stats = review_stats)
+    """
+    st.subheader("Accuracy")
+    st.caption(
+        "Share of correct answers across all reviews. The current streak is the number of correct answers in a row; "
+        "leeches are items answered incorrectly faster than their streak grows."
+    )
+
+    items, item_labels, _, _ = wkh.get_standard_data()
+    by_type = review_stats["by_type"]
+
+    for col, item, accuracy in zip(st.columns(3), items, by_type["accuracy"]):
+        col.metric(
+            label = item_labels[item],
+            value = rdh.format_percent(accuracy)
+        )
+
+    with mh.timer("figure.accuracy_table"):
+        df = rdh.make_accuracy_table(by_type)
+
+    # Inject CSS with Markdown to hide table index
+    hide_row_index = """
+        <style>
+            tbody th {display:none}
+            .blank {display:none}
+        </style>
+    """
+    st.markdown(hide_row_index, unsafe_allow_html = True)
+
+    st.table(df)
+
+    return None
+
+@mh.timed
+def display_accuracy_by_level_chart(review_stats):
+    """
+    Description
+        Displays a bar chart of the answer accuracy on each level.
+
+    Input
+        review_stats: dict; Output from get_review_stats.
+
+    Output
+        None
+
+    Example
+        display_accuracy_by_level_chart(review_stats = review_stats)
+    """
+    by_level = review_stats["by_level"]
+
+    if len(by_level["level"]) == 0:
+        return None
+
+    with mh.timer("figure.accuracy_by_level"):
+        fig = rdh.make_accuracy_by_level_figure(
+            by_level["level"],
+            np.round(by_level["accuracy"], 1),
+            by_level["leeches"]
+        )
+
+    with mh.timer("render.accuracy_by_level"):
+        st.plotly_chart(fig)
+
+    return None
+
+@mh.timed
+def display_leeches(review_stats):
+    """
+    Description
+        Displays the items with the highest leech scores.
+
+    Input
+        review_stats: dict; Output from get_review_stats.
+
+    Output
+        None
+
+    Example
+        display_leeches(review_stats = review_stats)
+    """
+    st.subheader("Leeches")
+
+    leeches = review_stats["leeches"]
+
+    if len(leeches) == 0:
+        st.caption("No leeches. Nice!")
+
+        return None
+
+    with mh.timer("figure.leeches_table"):
+        df = rdh.make_leeches_table(leeches)
+
+    # Inject CSS with Markdown to hide table index
+    hide_row_index = """
+        <style>
+            tbody th {display:none}
+            .blank {display:none}
+        </style>
+    """
+    st.markdown(hide_row_index, unsafe_allow_html = True)
+
+    st.table(df)
+
+    return None
+
+@mh.timed
+def get_debug_gauges():
+    """
+    Description
+        Collects point-in-time values from the cache, single-flight and HTTP layers for the metrics output.
+
+    Input
+        None
+
+    Output
+        gauges: dict; Metric name to number.
+
+    Example
+        get_debug_gauges()
+
+        {"cache.hits": 40, "cache.misses": 6, ..., "http.p95_seconds": 0.41}
+    """
+    gauges = {}
+
+    for name, value in cah.get_cache_stats().items():
+        gauges[f"cache.{name}"] = value
+
+    for name, value in flh.get_flight_stats().items():
+        gauges[f"flight.{name}"] = value
+
+    for token_digest, bucket in sch.get_scheduler_stats().items():
+        for name in ("tokens", "queued", "throttled"):
+            gauges[f"scheduler.{token_digest}.{name}"] = bucket[name]
+
+    for name, value in hh.get_latency_stats().items():
+        if value is not None:
+            gauges[f"http.{name}" if name in ("calls", "retries") else f"http.{name}_seconds"] = value
+
+    return gauges
+
+def write_metrics():
+    """
+    Description
+        Writes the collected metrics to the file named by the WANIKANI_METRICS_FILE environment variable, if set.
+
+    Input
+        None
+
+    Output
+        None
+
+    Example
+        write_metrics()
+    """
+    mh.write_metrics_file(gauges = get_debug_gauges())
+
+    return None
+
+def display_debug_panel():
+    """
+    Description
+        Adds a "Debug" toggle to the sidebar. When on, shows where the time went: helper, HTTP, decoding and
+        rendering timings, page and cache counters, and the cache, single-flight and HTTP latency summaries.
+
+    Input
+        None
+
+    Output
+        None
+
+    Example
+        display_debug_panel()
+    """
+    if not st.sidebar.checkbox("Debug", value = False):
+        return None
+
+    import pandas as pd
+
+    metrics = mh.get_metrics()
+
+    st.sidebar.subheader("Timings")
+    timings = pd.DataFrame([
+        {
+            "Name": name,
+            "Calls": timing["count"],
+            "Last (ms)": round(timing["last"] * 1000, 1),
+            "Mean (ms)": round(timing["total"] / timing["count"] * 1000, 1),
+            "Max (ms)": round(timing["max"] * 1000, 1)
+        }
+        for name, timing in sorted(metrics["timings"].items())
+    ])
+    st.sidebar.dataframe(timings)
+
+    st.sidebar.subheader("Counters")
+    st.sidebar.json({**metrics["counters"], **get_debug_gauges()})
+
+    return None
 
+@mh.timed
 def display_github_link():
     """
     Description
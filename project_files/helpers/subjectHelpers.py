@@ -0,0 +1,342 @@
+from data import wanikani
+from datetime import timedelta
+import helpers.fetchHelpers as fh
+import helpers.flightHelpers as flh
+import helpers.helpers as hp
+import helpers.httpHelpers as hh
+import json
+import numpy as np
+import os
+import threading
+import time
+
+catalog_name = "subjects.npy"
+state_name = "subjects.json"
+
+# The subject catalog changes a few times a year, so once a day is plenty.
+refresh_interval = 24 * 60 * 60
+
+# Seconds subtracted from the sync start time before it is saved as updated_after, to allow for clock skew.
+clock_margin = 60
+
+_loaded = {"signature": None, "catalog": None}
+_lock = threading.Lock()
+
+def get_catalog_paths():
+    """
+    Description
+        Returns where the subject catalog and its sync state are stored. Both are shared by every token.
+
+    Input
+        None
+
+    Output
+        catalog_path: string; NumPy file with one row per subject id.
+        state_path: string; JSON file with the high-water mark of the last sync.
+
+    Example
+        get_catalog_paths()
+
+        ("~/.cache/wanikani-stats-dashboard/subjects.npy", "~/.cache/wanikani-stats-dashboard/subjects.json")
+    """
+    data_dir = hp.get_data_dir()
+
+    return os.path.join(data_dir, catalog_name), os.path.join(data_dir, state_name)
+
+def make_catalog(size, characters_width = 1, meaning_width = 1):
+    """
+    Description
+        Creates an empty catalog. Row i describes subject id i, so a lookup is a single index operation.
+        Ids without a subject have level 0 and type -1.
+
+    Input
+        size: int; Number of rows (largest subject id + 1).
+        characters_width: int; Longest characters string to hold.
+        meaning_width: int; Longest primary meaning to hold.
+
+    Output
+        catalog: np.ndarray; Structured array with "level", "type" (index into wanikani.subject_types),
+            "hidden", "characters" and "meaning" fields.
+
+    Example
+        make_catalog(size = 9300, characters_width = 8, meaning_width = 40)
+    """
+    dtype = np.dtype([
+        ("level", np.int8),
+        ("type", np.int8),
+        ("hidden", np.bool_),
+        ("characters", f"<U{max(1, characters_width)}"),
+        ("meaning", f"<U{max(1, meaning_width)}")
+    ])
+
+    catalog = np.zeros(size, dtype = dtype)
+    catalog["type"] = -1
+
+    return catalog
+
+def merge_subjects(catalog, records):
+    """
+    Description
+        Writes subject resources into a catalog, growing it (more rows, wider strings) when needed.
+
+    Input
+        catalog: np.ndarray; Existing catalog, see make_catalog.
+        records: list; Subject resources from /subjects.
+
+    Output
+        merged: np.ndarray; New catalog containing the old rows updated with the records.
+
+    Example
+        merge_subjects(catalog = make_catalog(0), records = collection["data"])
+    """
+    if len(records) == 0:
+        return catalog
+
+    ids = np.fromiter((d["id"] for d in records), dtype = np.int64, count = len(records))
+    characters = [d["data"].get("characters") or "" for d in records]
+    meanings = [
+        next((m["meaning"] for m in d["data"].get("meanings", []) if m.get("primary")), "")
+        for d in records
+    ]
+
+    merged = make_catalog(
+        size = max(len(catalog), int(ids.max()) + 1),
+        characters_width = max([catalog.dtype["characters"].itemsize // 4] + [len(c) for c in characters]),
+        meaning_width = max([catalog.dtype["meaning"].itemsize // 4] + [len(m) for m in meanings])
+    )
+    merged[:len(catalog)] = catalog
+
+    merged["level"][ids] = [d["data"]["level"] for d in records]
+    merged["type"][ids] = [
+        wanikani.subject_types.index(d["object"]) if d["object"] in wanikani.subject_types else -1
+        for d in records
+    ]
+    merged["hidden"][ids] = [d["data"].get("hidden_at") is not None for d in records]
+    merged["characters"][ids] = characters
+    merged["meaning"][ids] = meanings
+
+    return merged
+
+def read_state():
+    """
+    Description
+        Reads the sync state of the subject catalog.
+
+    Input
+        None
+
+    Output
+        state: dict or None; "updated_after" of the last sync, None if the catalog was never built.
+
+    Example
+        read_state()
+
+        {"updated_after": "2022-06-30T18:04:11.123456Z"}
+    """
+    catalog_path, state_path = get_catalog_paths()
+
+    if not os.path.exists(catalog_path) or not os.path.exists(state_path):
+        return None
+
+    with open(state_path, encoding = "utf-8") as f:
+        state = json.load(f)
+
+    return state
+
+def write_catalog(catalog, state):
+    """
+    Description
+        Replaces the stored catalog and its sync state. Each file is written to a temporary name first and
+        moved into place, so readers (including memory maps opened by other sessions) never see a partial file.
+
+    Input
+        catalog: np.ndarray or None; Catalog to store, None to only update the state.
+        state: dict; Sync state, see read_state.
+
+    Output
+        None
+
+    Example
+        write_catalog(catalog = catalog, state = {"updated_after": "2022-06-30T18:04:11.123456Z"})
+    """
+    catalog_path, state_path = get_catalog_paths()
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+    if catalog is not None:
+        with open(catalog_path + suffix, "wb") as f:
+            np.save(f, catalog)
+        os.replace(catalog_path + suffix, catalog_path)
+
+    with open(state_path + suffix, "w", encoding = "utf-8") as f:
+        json.dump(state, f)
+    os.replace(state_path + suffix, state_path)
+
+    return None
+
+def sync_subjects(token):
+    """
+    Description
+        Brings the shared subject catalog up to date. Concurrent syncs in this process share a single run,
+        whichever token started them.
+
+    Input
+        token: string; Any valid user supplied token; the catalog is the same for every user.
+
+    Output
+        changed: int; Number of subjects inserted or updated.
+
+    Example
+        sync_subjects(token = token)
+
+        9
+    """
+    changed = flh.do(("sync/subjects",), lambda: run_sync_subjects(token))
+
+    return changed
+
+def run_sync_subjects(token):
+    """
+    Description
+        Runs one catalog sync; use sync_subjects, which coalesces concurrent calls.
+        The first sync downloads every subject, one subject type per partition in parallel (a handful of
+        requests, which matters under the 60 requests per minute limit). Later syncs only request
+        subjects changed since the last sync (updated_after). Both save the time the sync started as the
+        next updated_after, so a subject changed while the partitions were fetched is requested again.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        changed: int; Number of subjects inserted or updated.
+
+    Example
+        run_sync_subjects(token = token)
+
+        9
+    """
+    state = read_state()
+    url = hh.get_url("subjects")
+    started_at = hp.format_timestamp(hp.get_current_timestamp("UTC") - timedelta(seconds = clock_margin))
+
+    if state is None:
+        collection = fh.fetch_collection(token = token, url = url, partitions = fh.split_by("types", wanikani.subject_types))
+        records = collection["data"]
+        catalog = make_catalog(0)
+    else:
+        records = []
+        catalog = None
+
+        for page in fh.iter_pages(token = token, url = url, params = {"updated_after": state["updated_after"]}):
+            records.extend(page["data"])
+
+        if len(records) > 0:
+            catalog_path, _ = get_catalog_paths()
+            catalog = np.load(catalog_path)
+
+    if catalog is not None:
+        catalog = merge_subjects(catalog, records)
+
+    # The state file is rewritten even without changes; its modification time marks the last check.
+    write_catalog(catalog, {"updated_after": started_at})
+
+    return len(records)
+
+def get_catalog(token = None):
+    """
+    Description
+        Returns the subject catalog, memory-mapped read-only and shared by every session of the process.
+        With a token, the catalog is built if missing and refreshed once it is older than refresh_interval.
+        The map is reopened only when the file on disk was replaced.
+
+    Input
+        token: string or None; User supplied token, needed to build or refresh the catalog.
+
+    Output
+        catalog: np.memmap; Catalog indexed by subject id, see make_catalog.
+
+    Example
+        catalog = get_catalog(token = token)
+        catalog["level"][440]
+
+        1
+    """
+    catalog_path, state_path = get_catalog_paths()
+
+    if token is not None:
+        try:
+            age = time.time() - os.stat(state_path).st_mtime
+        except FileNotFoundError:
+            age = None
+
+        if age is None or age > refresh_interval:
+            sync_subjects(token)
+
+    stat = os.stat(catalog_path)
+    signature = (catalog_path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        if _loaded["signature"] != signature:
+            _loaded["catalog"] = np.load(catalog_path, mmap_mode = "r")
+            _loaded["signature"] = signature
+        catalog = _loaded["catalog"]
+
+    return catalog
+
+def lookup(catalog, subject_ids):
+    """
+    Description
+        Looks up many subjects at once. Each lookup is a direct index into the catalog; ids outside the
+        catalog come back with level 0 and type -1.
+
+    Input
+        catalog: np.ndarray; Catalog, see get_catalog.
+        subject_ids: array-like; Subject ids.
+
+    Output
+        subjects: np.ndarray; One catalog row per id.
+
+    Example
+        lookup(catalog = catalog, subject_ids = [1, 440, 2467])["level"]
+
+        array([1, 1, 1], dtype=int8)
+    """
+    ids = np.asarray(subject_ids, dtype = np.int64)
+    known = (ids >= 0) & (ids < len(catalog))
+
+    subjects = np.zeros(len(ids), dtype = catalog.dtype)
+    subjects["type"] = -1
+    subjects[known] = catalog[ids[known]]
+
+    return subjects
+
+def get_subject(catalog, subject_id):
+    """
+    Description
+        Looks up a single subject.
+
+    Input
+        catalog: np.ndarray; Catalog, see get_catalog.
+        subject_id: int; Subject id.
+
+    Output
+        subject: dict or None; "level", "type", "hidden", "characters" and "meaning", None for an unknown id.
+
+    Example
+        get_subject(catalog = catalog, subject_id = 440)
+
+        {"level": 1, "type": "kanji", "hidden": False, "characters": "一", "meaning": "One"}
+    """
+    if subject_id < 0 or subject_id >= len(catalog) or catalog["type"][subject_id] < 0:
+        return None
+
+    row = catalog[subject_id]
+
+    subject = {
+        "level": int(row["level"]),
+        "type": wanikani.subject_types[row["type"]],
+        "hidden": bool(row["hidden"]),
+        "characters": str(row["characters"]),
+        "meaning": str(row["meaning"])
+    }
+
+    return subject
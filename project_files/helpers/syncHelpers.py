@@ -0,0 +1,351 @@
+from data import wanikani
+from datetime import timedelta
+import helpers.fetchHelpers as fh
+import helpers.flightHelpers as flh
+import helpers.helpers as hp
+import helpers.httpHelpers as hh
+import helpers.projectionHelpers as ph
+import numpy as np
+import os
+import sqlite3
+
+db_name = "assignments.sqlite3"
+
+# Seconds the high-water mark is moved back from the start of a sync, in case our clock runs ahead of the API's.
+clock_margin = 60
+
+# The only assignment fields the store keeps; pages are projected onto them as soon as they are decoded.
+assignment_fields = {
+    "id": ("id", np.int64),
+    "subject_id": ("data.subject_id", np.int64),
+    "subject_type": ("data.subject_type", ph.category(*wanikani.subject_types)),
+    "srs_stage": ("data.srs_stage", np.int8),
+    "hidden": ("data.hidden", np.bool_),
+    "available_at": ("data.available_at", "datetime64[us]"),
+    "updated_at": ("data_updated_at", "datetime64[us]")
+}
+
+schema = """
+    CREATE TABLE IF NOT EXISTS assignments (
+        token_digest TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        subject_id INTEGER NOT NULL,
+        subject_type TEXT NOT NULL,
+        srs_stage INTEGER NOT NULL,
+        hidden INTEGER NOT NULL,
+        available_at TEXT,
+        updated_at TEXT,
+        PRIMARY KEY (token_digest, id)
+    );
+
+    CREATE TABLE IF NOT EXISTS sync_state (
+        token_digest TEXT NOT NULL,
+        endpoint TEXT NOT NULL,
+        updated_after TEXT,
+        PRIMARY KEY (token_digest, endpoint)
+    );
+"""
+
+def connect():
+    """
+    Description
+        Opens a connection to the local assignment store, creating the database and tables if needed.
+
+    Input
+        None
+
+    Output
+        connection: sqlite3.Connection; Connection to the assignment store.
+
+    Example
+        connect()
+    """
+    connection = sqlite3.connect(os.path.join(hp.get_data_dir(), db_name), timeout = 30)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.executescript(schema)
+
+    return connection
+
+def get_high_water_mark(connection, token_digest, endpoint = "assignments"):
+    """
+    Description
+        Returns the timestamp of the most recently synced change for a token and endpoint.
+
+    Input
+        connection: sqlite3.Connection; Connection to the assignment store.
+        token_digest: string; SHA-256 digest of the user supplied token.
+        endpoint: string; Synced endpoint (default: "assignments").
+
+    Output
+        updated_after: string or None; ISO-8601 timestamp, None if the token was never synced.
+
+    Example
+        get_high_water_mark(connection = connection, token_digest = token_digest)
+
+        "2022-06-30T18:04:11.123456Z"
+    """
+    row = connection.execute(
+        "SELECT updated_after FROM sync_state WHERE token_digest = ? AND endpoint = ?",
+        (token_digest, endpoint)
+    ).fetchone()
+
+    updated_after = None if row is None else row[0]
+
+    return updated_after
+
+def has_synced(token):
+    """
+    Description
+        Checks whether the assignments of a user were synced into the local store before.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        synced: bool; True if the token has a high-water mark, else False.
+
+    Example
+        has_synced(token = token)
+
+        True
+    """
+    connection = connect()
+
+    try:
+        synced = get_high_water_mark(connection, hp.get_token_digest(token)) is not None
+    finally:
+        connection.close()
+
+    return synced
+
+def sync_assignments(token):
+    """
+    Description
+        Brings the local copy of a user's assignments up to date. Concurrent syncs of the same token
+        (e.g. two browser tabs) share a single run.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        changed: int; Number of assignments inserted or updated.
+
+    Example
+        sync_assignments(token = token)
+
+        12
+    """
+    changed = flh.do(flh.make_request_key("sync/assignments", None, token), lambda: run_sync_assignments(token))
+
+    return changed
+
+def run_sync_assignments(token):
+    """
+    Description
+        Runs one assignment sync; use sync_assignments, which coalesces concurrent calls.
+        The first sync downloads every assignment. Later syncs only request assignments changed since the
+        last sync (updated_after) and upsert them, so a refresh usually costs a single request.
+        The high-water mark is the time the sync started, saved once every page has been stored: a change
+        made while the pages were being fetched may be missing from them, so the next sync requests it again.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        changed: int; Number of assignments inserted or updated.
+
+    Example
+        run_sync_assignments(token = token)
+
+        12
+    """
+    token_digest = hp.get_token_digest(token)
+    connection = connect()
+
+    try:
+        updated_after = get_high_water_mark(connection, token_digest)
+
+        # Taken before the first request, less a margin for the difference between our clock and the API's.
+        # Assignments changed since then are fetched again next time; re-storing them is harmless.
+        started_at = hp.format_timestamp(hp.get_current_timestamp("UTC") - timedelta(seconds = clock_margin))
+
+        # Hidden and unstarted assignments are stored as well, so changes that move an item out of the
+        # counted stages are picked up on the next incremental sync. A first sync downloads the subject types
+        # in parallel: an assignment never changes subject type, so unlike its SRS stage it cannot move from a
+        # partition not fetched yet to one already fetched. An incremental sync is streamed into the store
+        # page by page.
+        if updated_after is None:
+            pages = [fh.fetch_collection(
+                token = token,
+                url = hh.get_url("assignments"),
+                partitions = fh.split_by("subject_types", wanikani.subject_types),
+                fields = assignment_fields
+            )]
+        else:
+            pages = fh.iter_pages(
+                token = token,
+                url = hh.get_url("assignments"),
+                params = {"updated_after": updated_after}
+            )
+
+        changed = 0
+
+        with connection:
+            for page in pages:
+                columns = page["columns"] if "columns" in page else ph.project(page["data"], assignment_fields)
+
+                # A subject type missing from wanikani.subject_types (code -1) would not be counted anyway;
+                # dropping its assignments keeps one unknown value from failing the whole sync.
+                known = columns["subject_type"] >= 0
+                columns = {name: column[known] for name, column in columns.items()}
+
+                rows = list(zip(
+                    [token_digest] * len(columns["id"]),
+                    columns["id"].tolist(),
+                    columns["subject_id"].tolist(),
+                    ph.decode_category(columns["subject_type"], assignment_fields["subject_type"][1]),
+                    columns["srs_stage"].tolist(),
+                    columns["hidden"].astype(int).tolist(),
+                    ph.format_timestamps(columns["available_at"]),
+                    ph.format_timestamps(columns["updated_at"])
+                ))
+
+                connection.executemany(
+                    "INSERT OR REPLACE INTO assignments VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                changed += len(rows)
+
+            connection.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (token_digest, "assignments", started_at)
+            )
+    finally:
+        connection.close()
+
+    return changed
+
+def get_stored_counts(token):
+    """
+    Description
+        Counts the stored, non-hidden assignments of a user by SRS stage and item type (see wanikani.item_types).
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        counts: np.ndarray; Number of assignments indexed by (SRS stage, item type), shape (10, number of items).
+            Row 0 (lessons) is always zero.
+
+    Example
+        get_stored_counts(token = token)
+
+        array([[  0,   0,   0],
+               [  0,   4,  11],
+               ...
+               [225, 300, 901]])
+    """
+    counts = np.zeros((10, len(wanikani.items)), dtype = np.int64)
+
+    connection = connect()
+
+    try:
+        rows = connection.execute(
+            """
+                SELECT srs_stage, subject_type, COUNT(*)
+                FROM assignments
+                WHERE token_digest = ? AND hidden = 0 AND srs_stage BETWEEN 1 AND 9
+                GROUP BY srs_stage, subject_type
+            """,
+            (hp.get_token_digest(token),)
+        ).fetchall()
+    finally:
+        connection.close()
+
+    for srs_stage, subject_type, count in rows:
+        if subject_type in wanikani.item_types:
+            counts[srs_stage, wanikani.items.index(wanikani.item_types[subject_type])] += count
+
+    return counts
+
+def get_stored_stages(token):
+    """
+    Description
+        Returns the subject, item type and SRS stage of each stored, non-hidden assignment in SRS stages 1-9,
+        the rows get_stored_counts counts.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        subject_ids: np.ndarray; Subject id of each assignment.
+        types: np.ndarray; Index of each assignment's item type in wanikani.items (see wanikani.item_types).
+        srs_stages: np.ndarray; SRS stage of each assignment.
+
+    Example
+        get_stored_stages(token = token)
+
+        (array([440, 2467, ...]), array([1, 2, ...]), array([9, 5, ...]))
+    """
+    connection = connect()
+
+    try:
+        rows = connection.execute(
+            """
+                SELECT subject_id, subject_type, srs_stage
+                FROM assignments
+                WHERE token_digest = ? AND hidden = 0 AND srs_stage BETWEEN 1 AND 9
+            """,
+            (hp.get_token_digest(token),)
+        ).fetchall()
+    finally:
+        connection.close()
+
+    rows = [row for row in rows if row[1] in wanikani.item_types]
+
+    subject_ids = np.fromiter((row[0] for row in rows), dtype = np.int64, count = len(rows))
+    types = np.fromiter((wanikani.items.index(wanikani.item_types[row[1]]) for row in rows), dtype = np.int64, count = len(rows))
+    srs_stages = np.fromiter((row[2] for row in rows), dtype = np.int64, count = len(rows))
+
+    return subject_ids, types, srs_stages
+
+def get_stored_available_at(token):
+    """
+    Description
+        Returns when each stored, non-hidden assignment in SRS stages 1-8 is next up for review.
+        Burned and unstarted assignments have no review scheduled and are left out.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        available_at: np.ndarray; datetime64[us] review times in UTC.
+        types: np.ndarray; Index of each assignment's item type in wanikani.items (see wanikani.item_types).
+
+    Example
+        get_stored_available_at(token = token)
+
+        (array(['2022-07-01T02:00:00.000000', ...], dtype='datetime64[us]'), array([2, 1, ...]))
+    """
+    type_index = {subject_type: wanikani.items.index(item) for subject_type, item in wanikani.item_types.items()}
+
+    connection = connect()
+
+    try:
+        rows = connection.execute(
+            """
+                SELECT subject_type, available_at
+                FROM assignments
+                WHERE token_digest = ? AND hidden = 0 AND srs_stage BETWEEN 1 AND 8 AND available_at IS NOT NULL
+            """,
+            (hp.get_token_digest(token),)
+        ).fetchall()
+    finally:
+        connection.close()
+
+    rows = [(type_index[subject_type], available_at) for subject_type, available_at in rows if subject_type in type_index]
+
+    available_at = hp.parse_timestamps([available_at for _, available_at in rows])
+    types = np.fromiter((index for index, _ in rows), dtype = np.int64, count = len(rows))
+
+    return available_at, types
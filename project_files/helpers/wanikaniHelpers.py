@@ -1,11 +1,24 @@
 from data import wanikani
+import helpers.backgroundHelpers as bh
+import helpers.cacheHelpers as cah
+import helpers.countHelpers as ch
+import helpers.fetchHelpers as fh
+import helpers.forecastHelpers as fch
 import helpers.helpers as hp
+import helpers.httpHelpers as hh
+import helpers.levelHelpers as lh
+import helpers.metricsHelpers as mh
+import helpers.reviewHelpers as rvh
+import helpers.snapshotHelpers as snh
+import helpers.subjectHelpers as sh
+import helpers.syncHelpers as syh
 import numpy as np
-import pandas as pd
-import requests
-import streamlit as st
 
-@st.cache
+# Data older than its TTL is still served for up to a day while it is refreshed in the background.
+stale_ttl = 24 * 60 * 60
+
+@mh.timed
+@cah.cached(ttl = 3600)
 def check_token(token, wanikani_revision = "20170710", timezone = "America/Los_Angeles"):
     """
     Description
@@ -29,14 +42,11 @@ def check_token(token, wanikani_revision = "20170710", timezone = "America/Los_A
             "elapsed_time": "180"
         }
     """
-    response = requests.get(
-        url = "https://api.wanikani.com/v2/user",
-        params = {},
-        headers = {
-            "Wanikani-Revision": wanikani_revision,
-            "Authorization": f"Bearer {token}"
-        }
-    ).json()
+    response = hh.get_json(
+        token = token,
+        url = hh.get_url("user"),
+        wanikani_revision = wanikani_revision
+    )
 
     if response.get("code", None) == 401:
         user_data = None
@@ -53,8 +63,8 @@ def check_token(token, wanikani_revision = "20170710", timezone = "America/Los_A
 
         return user_data
 
-@st.cache
-def get_wanikani(token, url, params = {}, wanikani_revision = "20170710"):
+@mh.timed
+def get_standard_data():
     """
     Description
 
@@ -65,80 +75,106 @@ def get_wanikani(token, url, params = {}, wanikani_revision = "20170710"):
     Example
 
     """
-    return requests.get(
-        url = url,
-        params = params,
-        headers = {
-            "Wanikani-Revision": wanikani_revision,
-            "Authorization": f"Bearer {token}"
-        }
-    ).json()
+    return wanikani.items, wanikani.item_labels, wanikani.stages, wanikani.srs_stages
 
-def get_standard_data():
+@mh.timed
+def get_stage_bounds():
     """
     Description
+        Converts the stage groups in wanikani.srs_stages into row bounds of the count matrix.
 
     Input
+        None
 
     Output
+        starts: np.ndarray; First SRS stage of each stage group, in wanikani.stages order.
+        ends: np.ndarray; One past the last SRS stage of each stage group.
 
     Example
+        get_stage_bounds()
 
+        (array([1, 5, 7, 8, 9]), array([ 5,  7,  8,  9, 10]))
     """
-    return wanikani.items, wanikani.item_labels, wanikani.stages, wanikani.srs_stages
+    _, _, stages, srs_stages = get_standard_data()
+
+    starts = np.array([srs_stages[stage]["start"] for stage in stages])
+    ends = np.array([srs_stages[stage]["end"] + 1 for stage in stages])
+
+    return starts, ends
+
+stage_starts, stage_ends = get_stage_bounds()
 
-@st.cache
-def get_learned_counts(token):
+@mh.timed
+def get_stage_group_counts(counts):
     """
     Description
+        Sums the count matrix over every stage group at once, using prefix sums over the SRS stage axis.
 
     Input
+        counts: np.ndarray; Count matrix from get_learned_counts, shape (10, number of items).
 
     Output
+        group_counts: np.ndarray; Counts per stage group and item, shape (number of stages, number of items).
 
     Example
+        get_stage_group_counts(counts = counts)
 
+        array([[  1,  38,  70],
+               [ 14,  53, 131],
+               ...
+               [225, 300, 901]])
     """
-    items, item_labels, _, _ = get_standard_data()
+    prefix = np.zeros((counts.shape[0] + 1, counts.shape[1]), dtype = counts.dtype)
+    np.cumsum(counts, axis = 0, out = prefix[1:])
 
-    counts = {}
-    for stage in range(1,10):
-        counts[stage] = {}
-        for item in items:
-            counts[stage][item] = 0
+    group_counts = prefix[stage_ends] - prefix[stage_starts]
 
-    response = get_wanikani(
-        token = token,
-        url = "https://api.wanikani.com/v2/assignments",
-        params = {
-            "srs_stages": "1,2,3,4,5,6,7,8,9",
-            "hidden": "false"
-        }
-    )
+    return group_counts
 
-    for d in response["data"]:
-        srs_stage = d["data"]["srs_stage"]
-        subject_type = d["data"]["subject_type"]
-        counts[srs_stage][subject_type] += 1
+@mh.timed
+@cah.cached(ttl = 300, stale_ttl = stale_ttl)
+def get_learned_counts(token, counts_only = False):
+    """
+    Description
+        Counts a user's non-hidden assignments by SRS stage and item type. Lessons (SRS stage 0) are not counted.
+        The dashboard counts from the local assignment store, which the forecast and the level cube read as
+        well, so the assignments are downloaded once and later visits only sync changes. Callers that only
+        need the counts (e.g. the batch report) can let large accounts use the cheaper total_count engine.
 
-    next_url = response["pages"]["next_url"]
+    Input
+        token: string; User supplied token.
+        counts_only: bool; True if the caller needs no local store (default: False).
 
-    while next_url:
-        response = get_wanikani(
-            token = token,
-            url = next_url
-        )
+    Output
+        items: tuple; Item types, in column order (wanikani.items).
+        item_labels: dict; Display label of each item type.
+        counts: np.ndarray; Number of assignments indexed by (SRS stage, item type), shape (10, number of items).
+            counts[srs_stage, i] is the number of items[i] at that SRS stage; row 0 is always zero.
 
-        for d in response["data"]:
-            srs_stage = d["data"]["srs_stage"]
-            subject_type = d["data"]["subject_type"]
-            counts[srs_stage][subject_type] += 1
+    Example
+        items, item_labels, counts = get_learned_counts(token = token)
+        counts[5:].sum(axis = 0)
 
-        next_url = response["pages"]["next_url"]
+        array([289, 561, 1681])
+    """
+    items, item_labels, _, _ = get_standard_data()
+
+    # Accounts already in the local store only need an incremental sync. Without a store, the engine is picked
+    # by account size: paging downloads (and stores) every assignment, total_count sends one query per cell.
+    if not counts_only or syh.has_synced(token) or ch.choose_count_engine(ch.get_assignment_total(token)) == "paging":
+        syh.sync_assignments(token)
+
+        counts = syh.get_stored_counts(token)
+    else:
+        counts = ch.get_counts_by_total(token)
+
+    # Keeps the history for the progress trend chart, which is drawn from these snapshots without API calls.
+    snh.record_snapshot(token, counts)
 
     return items, item_labels, counts
 
-@st.cache
+@mh.timed
+@cah.cached(ttl = 3600)
 def get_item_breakdown(counts, breakdown_type):
     """
     Description
@@ -150,129 +186,261 @@ def get_item_breakdown(counts, breakdown_type):
     Example
 
     """
-    items, item_labels, stages, srs_stages = get_standard_data()
+    import pandas as pd
+
+    items, item_labels, stages, _ = get_standard_data()
+
+    # group_counts: (stage, item) array, e.g. group_counts[0] holds the Apprentice counts of each item
+    group_counts = get_stage_group_counts(counts)
+    labels = [item_labels[item] for item in items]
 
     if breakdown_type == "Bar Chart":
-        df = pd.DataFrame(columns = ["Item", "Stage", "Count"])
-        for item in items:
-            for stage in stages:
-                df.loc[len(df.index)] = [
-                    item_labels[item],
-                    stage,
-                    sum([counts[s][item] for s in range(srs_stages[stage]["start"], srs_stages[stage]["end"] + 1)])
-                ]
+        df = pd.DataFrame({
+            "Item": np.repeat(labels, len(stages)),
+            "Stage": np.tile(stages, len(items)),
+            "Count": group_counts.T.ravel()
+        })
 
     elif breakdown_type == "Table":
-        df = {"Stage": stages}
-        for item in items:
-            df[item_labels[item]] = [sum([counts[s][item] for s in range(srs_stages[stage]["start"], srs_stages[stage]["end"] + 1)]) for stage in stages]
-
-        df = pd.DataFrame(df)
+        df = pd.DataFrame(
+            np.vstack([group_counts, group_counts.sum(axis = 0)]),
+            columns = labels
+        )
 
-        df.loc[len(df.index)] = [
-            "All",
-            df["Radical 部首"].sum(),
-            df["Kanji 漢字"].sum(),
-            df["Vocabulary 単語"].sum()
-        ]
+        df.insert(0, "Stage", list(stages) + ["All"])
 
     return df
 
-@st.cache
-def get_levels(token, timezone = "America/Los_Angeles"):
+@mh.timed
+@cah.cached(ttl = 900, stale_ttl = stale_ttl)
+def get_levels(token):
     """
     Description
+        Fetches a user's level progressions and resets, and stores them as aligned arrays (see levelHelpers).
 
     Input
+        token: string; User supplied token.
 
     Output
+        levels: dict; Output from levelHelpers.build_progressions.
 
     Example
+        get_levels(token = token)
 
+        {"level": array([1, 2, 3]), "started_at": array([...]), "passed_at": array([...]), "index": {1: 0, 2: 1, 3: 2}}
     """
-    levels = {}
+    levels = lh.build_progressions(
+        level_progressions = fh.iter_collection(token = token, url = hh.get_url("level_progressions")),
+        resets = fh.iter_collection(token = token, url = hh.get_url("resets"))
+    )
 
-    for i in get_wanikani(token = token, url = "https://api.wanikani.com/v2/level_progressions")["data"]:
-        l = i["data"]["level"]
+    return levels
 
-        levels[l] = {
-            "started_datetime": hp.parse_timestamp(i["data"]["started_at"], timezone = timezone),
-            "passed_datetime": hp.parse_timestamp(i["data"]["passed_at"], timezone = timezone)
-        }
+@mh.timed
+@cah.cached(ttl = 900, stale_ttl = stale_ttl)
+def get_review_stats(token):
+    """
+    Description
+        Computes a user's accuracy, streak and leech statistics from their review statistics (see reviewHelpers).
 
-        if (levels[l]["started_datetime"] is not None) and (levels[l]["passed_datetime"] is not None):
-            levels[l]["elapsed_time"] = levels[l]["passed_datetime"] - levels[l]["started_datetime"]
-        elif levels[l]["started_datetime"] is not None:
-            levels[l]["elapsed_time"] = hp.get_current_timestamp(timezone) - levels[l]["started_datetime"]
-        else:
-            levels[l]["elapsed_time"] = None
+    Input
+        token: string; User supplied token.
 
-    return levels
+    Output
+        review_stats: dict; Output from reviewHelpers.get_review_stats.
+
+    Example
+        get_review_stats(token = token)
+    """
+    review_stats = rvh.get_review_stats(token)
 
-@st.cache
-def get_level_up_stats(levels):
+    return review_stats
+
+@mh.timed
+def update_store(token):
     """
     Description
+        Brings a user's local assignment store up to date for the sections that read it directly. The sync
+        runs inside get_learned_counts, so it is cached and shared with the counts: at most one incremental
+        sync per cache period, however many sections call this.
 
     Input
+        token: string; User supplied token.
 
     Output
+        None
 
     Example
+        update_store(token = token)
+    """
+    get_learned_counts(token)
+
+    return None
 
+@mh.timed
+@cah.cached(ttl = 300, stale_ttl = stale_ttl)
+def get_upcoming_reviews(token):
     """
-    times = [hp.seconds_to_days(levels[key]["elapsed_time"].total_seconds()) for key in levels.keys() if levels[key]["elapsed_time"] is not None]
-
-    if len(times) == 0:
-        return {
-            "mean": None,
-            "median": None,
-            "variance": None,
-            "standard_deviation": None,
-            "min": None,
-            "max": None
-        }
-    else:
-        return {
-            "mean": round(np.mean(times), 1),
-            "median": round(np.median(times), 1),
-            "variance": round(np.var(times), 1),
-            "standard_deviation": round(np.std(times), 1),
-            "min": round(np.min(times), 1),
-            "max": round(np.max(times), 1)
-        }
+    Description
+        Returns the next review time of each of a user's assignments, read from the local assignment store.
+        The store is brought up to date by update_store, so this makes no API calls of its own.
 
-@st.cache
-def get_level_stats(selected_level, levels):
+    Input
+        token: string; User supplied token.
+
+    Output
+        available_at: np.ndarray; datetime64[us] review times in UTC.
+        types: np.ndarray; Index of each review's item type in wanikani.items.
+
+    Example
+        get_upcoming_reviews(token = token)
+    """
+    update_store(token)
+
+    available_at, types = syh.get_stored_available_at(token)
+
+    return available_at, types
+
+@mh.timed
+def build_level_cube(levels, types, srs_stages):
     """
     Description
+        Counts assignments by level, item type and SRS stage in a single bincount over a flat cell index.
 
     Input
+        levels: np.ndarray; Level of each assignment's subject; levels outside wanikani.levels are left out.
+        types: np.ndarray; Index of each assignment's item type in wanikani.items.
+        srs_stages: np.ndarray; SRS stage of each assignment.
 
     Output
+        cube: np.ndarray; Number of assignments indexed by (level - 1, item type, SRS stage),
+            shape (number of levels, number of items, 10).
 
     Example
-        
+        build_level_cube(levels = np.array([1, 1, 2]), types = np.array([0, 1, 1]), srs_stages = np.array([9, 9, 5]))[0, :, 9]
+
+        array([1, 1, 0])
     """
-    time_on_level = levels[selected_level]["elapsed_time"]
+    shape = (len(wanikani.levels), len(wanikani.items), 10)
 
-    if time_on_level is not None:
-        time_on_level = round(hp.seconds_to_days(time_on_level.total_seconds()), 1)
+    levels = np.asarray(levels, dtype = np.int64)
+    known = (levels >= wanikani.levels.start) & (levels < wanikani.levels.stop)
 
-    if selected_level > 1:
-        previous_level = selected_level - 1
-        time_on_previous_level = round(hp.seconds_to_days(levels[previous_level]["elapsed_time"].total_seconds()), 1)
-        time_difference = time_on_level - time_on_previous_level if time_on_level is not None else None
-    else:
-        previous_level = None
-        time_on_previous_level = None
-        time_difference = None
-
-    return {
-        "level": selected_level,
-        "time_on_level": time_on_level,
-        "previous_level": previous_level,
-        "time_on_previous_level": time_on_previous_level,
-        "delta": time_difference,
-        "delta_color": "inverse"
-    }
+    cells = np.ravel_multi_index((levels[known] - wanikani.levels.start, types[known], srs_stages[known]), shape)
+    cube = np.bincount(cells, minlength = np.prod(shape)).reshape(shape)
+
+    return cube
+
+@mh.timed
+@cah.cached(ttl = 300, stale_ttl = stale_ttl)
+def get_level_counts(token):
+    """
+    Description
+        Counts a user's assignments by level, item type and SRS stage, joining the stored assignments to the
+        subject catalog on subject_id. Any level range and stage group can then be sliced out of the cube
+        without further API calls.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        cube: np.ndarray; Output from build_level_cube. Summed over levels, it equals the counts of
+            get_learned_counts (transposed).
+
+    Example
+        get_level_counts(token = token)[:10, :, 5:].sum()
+
+        1204
+    """
+    update_store(token)
+
+    subject_ids, types, srs_stages = syh.get_stored_stages(token)
+    levels = sh.lookup(sh.get_catalog(token), subject_ids)["level"]
+
+    cube = build_level_cube(levels, types, srs_stages)
+
+    return cube
+
+@mh.timed
+def get_review_forecast(token, bin_hours = 1, bins = 24, timezone = "America/Los_Angeles"):
+    """
+    Description
+        Bins a user's upcoming reviews by time and item type. The review times are cached; the binning is
+        redone on every call, so the forecast moves with the clock without new requests.
+
+    Input
+        token: string; User supplied token.
+        bin_hours: int; Width of a bin in hours (default: 1).
+        bins: int; Number of bins (default: 24).
+        timezone: string; Timezone that daily bins are aligned to.
+
+    Output
+        starts: np.ndarray; datetime64[us] start of each bin in UTC.
+        forecast: np.ndarray; Number of reviews indexed by (bin, item type).
+
+    Example
+        get_review_forecast(token = token, bin_hours = 24, bins = 7)
+    """
+    available_at, types = get_upcoming_reviews(token)
+
+    starts, forecast = fch.bin_available_at(
+        available_at = available_at,
+        types = types,
+        now = hp.get_current_timestamp(timezone),
+        bin_hours = bin_hours,
+        bins = bins
+    )
+
+    return starts, forecast
+
+@mh.timed
+def get_progress_trend(token, days = None, srs_stage_start = 5, srs_stage_end = 9):
+    """
+    Description
+        Returns the number of items in a range of SRS stages on each day a snapshot was recorded, from the
+        local snapshot store only (see snapshotHelpers), so it costs no API calls.
+
+    Input
+        token: string; User supplied token.
+        days: int or None; Number of days back from today to include, None for the whole history.
+        srs_stage_start: int; The minimum SRS stage to count (default: 5; Guru 1).
+        srs_stage_end: int; The maximum SRS stage to count (default: 9; Burned).
+
+    Output
+        dates: np.ndarray; datetime64[D] day of each snapshot, ascending.
+        trend: np.ndarray; Number of items indexed by (day, item type).
+
+    Example
+        get_progress_trend(token = token, days = 30)
+
+        (array(['2026-09-18', ...], dtype='datetime64[D]'), array([[289, 561, 1681], ...]))
+    """
+    start = None if days is None else snh.get_day() - days
+
+    dates, counts = snh.get_snapshots(token, start = start)
+
+    trend = counts[:, srs_stage_start:srs_stage_end + 1].sum(axis = 1)
+
+    return dates, trend
+
+@mh.timed
+def prefetch(token):
+    """
+    Description
+        Starts loading every section's data on the background pool, so the sections below the fold are being
+        fetched while the ones above are rendered. The cached helpers coalesce with these calls, so nothing
+        is fetched twice.
+
+    Input
+        token: string; User supplied token, already checked with check_token.
+
+    Output
+        None
+
+    Example
+        prefetch(token = token)
+    """
+    for func in (get_learned_counts, get_levels, get_upcoming_reviews, get_level_counts, get_review_stats):
+        bh.submit(f"prefetch.{func.__name__}", func, token)
+
+    return None
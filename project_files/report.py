@@ -0,0 +1,178 @@
+"""
+Headless batch report: fetches and aggregates Wanikani statistics for many tokens without Streamlit.
+
+Run from project_files:
+    python report.py tokens.txt --output report.jsonl
+    python report.py tokens.txt --output report.parquet --format parquet --workers 8
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import sys
+
+import helpers.helpers as hp
+import helpers.levelHelpers as lh
+import helpers.wanikaniHelpers as wkh
+
+def read_tokens(path):
+    """
+    Description
+        Reads one token per line from a file. Blank lines and lines starting with "#" are skipped.
+
+    Input
+        path: string; Path of the tokens file.
+
+    Output
+        tokens: list; Tokens in file order.
+
+    Example
+        read_tokens(path = "tokens.txt")
+
+        ["ab12c3de-12a3-1a23-abcd-ab123cd45e67", ...]
+    """
+    with open(path, encoding = "utf-8") as f:
+        tokens = [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
+    return tokens
+
+def build_report(token):
+    """
+    Description
+        Fetches and aggregates the statistics of one token with the same helpers the dashboard uses.
+        Errors are reported in the result instead of being raised, so one bad token does not stop the batch.
+
+    Input
+        token: string; User supplied token.
+
+    Output
+        report: dict; Token digest (the token itself is never written), username, counts, breakdown,
+            level-up stats, per-level days, and an error message (None on success).
+
+    Example
+        build_report(token = token)
+
+        {"token_digest": "9f86d0...", "username": "jdngo", "counts": [[0, 0, 0], ...], ..., "error": None}
+    """
+    report = {"token_digest": hp.get_token_digest(token), "username": None, "error": None}
+
+    try:
+        user_data = wkh.check_token(token)
+        if not user_data:
+            report["error"] = "invalid token"
+
+            return report
+
+        items, item_labels, counts = wkh.get_learned_counts(token, counts_only = True)
+        breakdown = wkh.get_item_breakdown(counts, "Table")
+
+        levels = wkh.get_levels(token)
+        elapsed_days, in_progress = lh.get_elapsed_days(levels)
+
+        report.update({
+            "username": user_data["username"],
+            "started_date": user_data["started_date"],
+            "items": list(items),
+            "counts": counts.tolist(),
+            "breakdown": {
+                row["Stage"]: {item: int(row[item_labels[item]]) for item in items}
+                for row in breakdown.to_dict("records")
+            },
+            "level_up_stats": lh.get_level_up_stats(levels),
+            "levels": [
+                {
+                    "level": int(level),
+                    "days": None if days != days else round(float(days), 1),
+                    "in_progress": bool(progress)
+                }
+                for level, days, progress in zip(levels["level"], elapsed_days, in_progress)
+            ]
+        })
+    except Exception as error:
+        report["error"] = f"{type(error).__name__}: {error}"
+
+    return report
+
+def write_jsonl(reports, path):
+    """
+    Description
+        Writes reports as JSON Lines, one report per line, as they arrive.
+
+    Input
+        reports: iterable; Output from build_report.
+        path: string; Output file, "-" for standard output.
+
+    Output
+        count: int; Number of reports written.
+
+    Example
+        write_jsonl(reports = reports, path = "report.jsonl")
+    """
+    count = 0
+    f = sys.stdout if path == "-" else open(path, "w", encoding = "utf-8")
+
+    try:
+        for report in reports:
+            f.write(json.dumps(report, ensure_ascii = False) + "\n")
+            f.flush()
+            count += 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+    return count
+
+def write_parquet(reports, path):
+    """
+    Description
+        Writes reports as a Parquet file with one row per token. Nested fields are stored as JSON strings.
+        Requires pyarrow or fastparquet.
+
+    Input
+        reports: iterable; Output from build_report.
+        path: string; Output file.
+
+    Output
+        count: int; Number of reports written.
+
+    Example
+        write_parquet(reports = reports, path = "report.parquet")
+    """
+    import pandas as pd
+
+    rows = [
+        {
+            key: json.dumps(value, ensure_ascii = False) if isinstance(value, (dict, list)) else value
+            for key, value in report.items()
+        }
+        for report in reports
+    ]
+
+    pd.DataFrame(rows).to_parquet(path, index = False)
+
+    return len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description = "Build Wanikani statistics for a file of tokens, without Streamlit.")
+    parser.add_argument("tokens", help = "File with one Wanikani personal access token per line.")
+    parser.add_argument("--output", default = "-", help = "Output file (default: standard output, JSON Lines only).")
+    parser.add_argument("--format", choices = ["jsonl", "parquet"], default = "jsonl", help = "Output format (default: jsonl).")
+    parser.add_argument("--workers", type = int, default = 4, help = "Number of tokens processed at the same time (default: 4).")
+    args = parser.parse_args()
+
+    if args.format == "parquet" and args.output == "-":
+        parser.error("--format parquet needs an --output file")
+
+    tokens = read_tokens(args.tokens)
+
+    with ProcessPoolExecutor(max_workers = max(1, args.workers)) as executor:
+        reports = executor.map(build_report, tokens)
+
+        if args.format == "jsonl":
+            count = write_jsonl(reports, args.output)
+        else:
+            count = write_parquet(reports, args.output)
+
+    print(f"Wrote {count} report(s) for {len(tokens)} token(s).", file = sys.stderr)
+
+if __name__ == "__main__":
+    main()
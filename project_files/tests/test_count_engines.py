@@ -0,0 +1,76 @@
+"""
+Equivalence of the two counting engines of get_learned_counts against the offline mock API: total_count
+(one count query per SRS stage and item type) and paging (sync every assignment into the local store, then
+count there). Both must skip hidden and unstarted (SRS stage 0) assignments and count kana-only
+vocabulary as vocabulary.
+
+Run from project_files:
+    python -m pytest -q
+"""
+import numpy as np
+import pytest
+
+from benchmarks import mock_api
+from data import wanikani
+import helpers.cacheHelpers as cah
+import helpers.countHelpers as ch
+import helpers.httpHelpers as hh
+import helpers.schedulerHelpers as sch
+import helpers.syncHelpers as syh
+
+token = "mock-token"
+
+@pytest.fixture(params = [(500, 0), (3000, 1)], ids = ["500-assignments", "3000-assignments"])
+def server(request, tmp_path, monkeypatch):
+    assignments, seed = request.param
+
+    monkeypatch.setenv("WANIKANI_STATS_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(sch, "enabled", False)
+    cah.clear_cache()
+
+    server = mock_api.start_server(assignments = assignments, seed = seed)
+    monkeypatch.setattr(hh, "api_url", server.url)
+
+    yield server
+
+    server.shutdown()
+
+def test_account_has_hidden_unstarted_and_kana_assignments(server):
+    records = server.account["assignments"]
+
+    assert any(record["data"]["hidden"] for record in records)
+    assert any(record["data"]["srs_stage"] == 0 for record in records)
+    assert any(record["data"]["subject_type"] == "kana_vocabulary" for record in records)
+
+def test_total_count_matches_paging(server):
+    by_total = ch.get_counts_by_total(token)
+
+    syh.sync_assignments(token)
+    by_paging = syh.get_stored_counts(token)
+
+    assert by_total.shape == by_paging.shape == (10, 3)
+    assert by_total.sum() > 0
+    np.testing.assert_array_equal(by_total, by_paging)
+
+def test_counts_skip_hidden_and_unstarted(server):
+    # Kana-only vocabulary is counted as vocabulary (wanikani.item_types).
+    expected = np.zeros((10, 3), dtype = np.int64)
+    for record in server.account["assignments"]:
+        data = record["data"]
+        if not data["hidden"] and data["srs_stage"] >= 1:
+            expected[data["srs_stage"], wanikani.items.index(wanikani.item_types[data["subject_type"]])] += 1
+
+    np.testing.assert_array_equal(ch.get_counts_by_total(token), expected)
+
+def test_chosen_engine_sends_fewer_requests(server):
+    server.reset_stats()
+    ch.get_counts_by_total(token)
+    ch.get_assignment_total(token)
+    total_count_requests = server.requests
+
+    server.reset_stats()
+    syh.sync_assignments(token)
+    paging_requests = server.requests
+
+    engine = ch.choose_count_engine(len(server.account["assignments"]))
+    assert engine == ("paging" if paging_requests <= total_count_requests else "total_count")
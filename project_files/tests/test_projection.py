@@ -0,0 +1,30 @@
+"""
+Merging of projected pages: an id returned by two partitions keeps its most recently updated copy.
+
+Run from project_files:
+    python -m pytest -q
+"""
+import numpy as np
+import pytest
+
+import helpers.projectionHelpers as ph
+
+fields = {
+    "id": ("id", np.int64),
+    "srs_stage": ("data.srs_stage", np.int8),
+    "updated_at": ("data_updated_at", "datetime64[us]")
+}
+
+def make_record(id, srs_stage, updated_at):
+    return {"id": id, "data_updated_at": updated_at, "data": {"srs_stage": srs_stage}}
+
+older = [make_record(1, 4, "2024-01-01T00:00:00.000000Z"), make_record(2, 3, "2024-01-01T00:00:00.000000Z"), make_record(3, 2, "2024-01-01T00:00:00.000000Z")]
+newer = [make_record(1, 5, "2024-01-02T00:00:00.000000Z"), make_record(2, 1, None)]
+
+@pytest.mark.parametrize("pages", [[older, newer], [newer, older]], ids = ["older-first", "newer-first"])
+def test_concat_keeps_latest_copy(pages):
+    columns = ph.concat([ph.project(page, fields) for page in pages], fields, key = "id", latest = "updated_at")
+
+    np.testing.assert_array_equal(columns["id"], [1, 2, 3])
+    # Id 1 moved to stage 5 between the partitions; the copy without an update time never wins.
+    np.testing.assert_array_equal(columns["srs_stage"], [5, 3, 2])
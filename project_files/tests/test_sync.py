@@ -0,0 +1,89 @@
+"""
+Assignment sync against the offline mock API: changes made while a sync is running are not lost.
+
+Run from project_files:
+    python -m pytest -q
+"""
+import numpy as np
+import pytest
+
+from benchmarks import mock_api
+import helpers.cacheHelpers as cah
+import helpers.countHelpers as ch
+import helpers.fetchHelpers as fh
+import helpers.httpHelpers as hh
+import helpers.schedulerHelpers as sch
+import helpers.syncHelpers as syh
+
+token = "mock-token"
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setenv("WANIKANI_STATS_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(sch, "enabled", False)
+    cah.clear_cache()
+
+    server = mock_api.start_server(assignments = 2000)
+    monkeypatch.setattr(hh, "api_url", server.url)
+
+    yield server
+
+    server.shutdown()
+
+def test_change_during_first_sync_is_picked_up(server, monkeypatch):
+    # Partitions are fetched one at a time. Right after the second one, an assignment it returned moves back
+    # to SRS stage 0, and an assignment that is fetched later is updated after that.
+    monkeypatch.setattr(fh, "max_workers", 1)
+    fetch_partition = fh.fetch_partition
+    calls = []
+
+    def fetch_then_change(*args, **kwargs):
+        result = fetch_partition(*args, **kwargs)
+        calls.append(result)
+
+        if len(calls) == 2:
+            fetched = set(int(id) for part in calls for columns in part["columns"] for id in columns["id"])
+            moved = int(result["columns"][0]["id"][0])
+            later = next(record["id"] for record in server.account["assignments"] if record["id"] not in fetched)
+
+            server.update("assignments", moved, srs_stage = 0)
+            server.update("assignments", later, srs_stage = 9)
+
+        return result
+
+    monkeypatch.setattr(fh, "fetch_partition", fetch_then_change)
+    syh.sync_assignments(token)
+    monkeypatch.setattr(fh, "fetch_partition", fetch_partition)
+
+    # The incremental sync must bring the store in line with the API.
+    syh.sync_assignments(token)
+
+    np.testing.assert_array_equal(syh.get_stored_counts(token), ch.get_counts_by_total(token))
+
+def test_unknown_subject_type_does_not_fail_the_sync(server):
+    unknown, changed = [record["id"] for record in server.account["assignments"][:2]]
+
+    server.update("assignments", unknown, subject_type = "new_type")
+    syh.sync_assignments(token)
+
+    server.update("assignments", changed, srs_stage = 9)
+    syh.sync_assignments(token)
+
+    np.testing.assert_array_equal(syh.get_stored_counts(token), ch.get_counts_by_total(token))
+
+def test_empty_account_is_synced_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("WANIKANI_STATS_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(sch, "enabled", False)
+
+    server = mock_api.start_server(assignments = 0)
+    monkeypatch.setattr(hh, "api_url", server.url)
+
+    try:
+        syh.sync_assignments(token)
+        assert syh.has_synced(token)
+
+        server.reset_stats()
+        syh.sync_assignments(token)
+        assert server.requests == 1
+    finally:
+        server.shutdown()